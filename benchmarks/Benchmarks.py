@@ -0,0 +1,219 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+WORDS = ("the quick brown fox jumps over lazy dog while seven wizards quietly pack boxes of liquor and jugs "
+         "made from mixed zinc").split()
+
+
+def measure(fn, repeat=7, min_time=0.05):
+    """
+    Time a function the way timeit does: find a loop count that runs for at least min_time seconds, then
+    repeat the timing and keep the per-call times.
+
+    Args:
+        fn (callable): The function to time, called without arguments.
+        repeat (int, optional): The number of timed repetitions. Defaults to 7.
+        min_time (float, optional): The minimum duration of one repetition in seconds. Defaults to 0.05.
+
+    Returns:
+        dict: The loop count and the minimum, median and maximum time per call in microseconds.
+    """
+    fn()  # Warm up caches the way a running game has them warm
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - started >= min_time:
+            break
+        loops *= 2
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        timings.append((time.perf_counter() - started) / loops * 1e6)
+    return {
+        "loops": loops,
+        "min_us": min(timings),
+        "median_us": statistics.median(timings),
+        "max_us": max(timings),
+    }
+
+
+def make_sentence(rng, word_count):
+    """
+    Return a sentence of random words with the given word count.
+    """
+    return " ".join(rng.choice(WORDS) for _ in range(word_count))
+
+
+def seed_database(db, users=1000, sentences=50000, results=100000, days=30, seed=0):
+    """
+    Fill an empty database with realistic row counts: sentences of 10, 20 and 50 words, users and a history
+    of results spread over the last days.
+    """
+    if db.get_user_id_by_username("user0") is not None:
+        return
+    rng = random.Random(seed)
+    db.insert_sentences([(make_sentence(rng, word_count), word_count)
+                         for word_count in (10, 20, 50) for _ in range(sentences // 3)])
+    with db.connection() as (connection, cursor):
+        cursor.executemany("INSERT INTO users (username, password) VALUES (%s, %s)",
+                           [("user{}".format(number), "password{}".format(number)) for number in range(users)])
+        connection.commit()
+    now = datetime.datetime.now()
+    batch = []
+    for game_id in range(results):
+        date_played = now - datetime.timedelta(seconds=rng.randrange(days * 86400))
+        batch.append((rng.randrange(1, users + 1), game_id, rng.uniform(20, 140), rng.uniform(70, 100),
+                      rng.uniform(10, 120), date_played))
+        if len(batch) == 5000:
+            db.insert_user_statistics_batch(batch)
+            batch = []
+    db.insert_user_statistics_batch(batch)
+
+
+def game_benchmarks(game):
+    """
+    Return the benchmarks of the rendering and statistics hot paths of a headless game.
+    """
+    from src import Game
+
+    rng = random.Random(1)
+    short_text = make_sentence(rng, 10)
+    long_text = make_sentence(rng, 50)
+    game.words = long_text
+    game.input_text = long_text[:len(long_text) // 2]
+    game.cursor_position = len(game.input_text)
+    game.statistics.reset(game.words)
+    game.statistics.recount(game.input_text)
+    game.elapsed_time = 30
+    font_size = game.get_scaled_font_size()
+    position = game.get_relative_pos(0.5, 0.14)
+    color = Game.TEXT_COLOR
+
+    return [
+        ("render_text short target", lambda: game.render_text(short_text, position, font_size, color)),
+        ("render_text long target", lambda: game.render_text(long_text, position, font_size, color)),
+        ("draw_words long highlighted", game.draw_words),
+        ("render_text long input", lambda: game.render_text(game.input_text, position, font_size, color,
+                                                            underline=True, cursor_visible=True,
+                                                            input_text=True)),
+        ("get_text_width short", lambda: Game.get_text_width(short_text, font_size)),
+        ("get_text_width long", lambda: Game.get_text_width(long_text, font_size)),
+        ("calculate_statistics", game.calculate_statistics),
+        ("display_time", game.display_time),
+        ("display_statistics", game.display_statistics),
+        ("DifficultyButton.draw", lambda: game.login_button.draw(game.screen)),
+        ("TextButton.draw", lambda: game.leaderboard_button.draw(game.screen)),
+        ("RestartButton.draw", lambda: game.restart_button.draw(game.screen)),
+    ]
+
+
+def database_benchmarks(db):
+    """
+    Return the benchmarks of the database queries.
+    """
+    rng = random.Random(2)
+    now = datetime.datetime.now()
+    return [
+        ("get_random_sentence_by_word_count", lambda: db.get_random_sentence_by_word_count(20)),
+        ("get_random_sentences_by_word_count 5", lambda: db.get_random_sentences_by_word_count(20, 5)),
+        ("get_sentence_ids_by_word_count", lambda: db.get_sentence_ids_by_word_count(20)),
+        ("get_user_id_by_username", lambda: db.get_user_id_by_username("user500")),
+        ("verify_user_credentials", lambda: db.verify_user_credentials("user500", "password500")),
+        ("check_user_credentials", lambda: db.check_user_credentials("user500", "password500")),
+        ("authenticate_user", lambda: db.authenticate_user("user500", "password500")),
+        ("get_top_scores", lambda: db.get_top_scores(limit=5)),
+        ("get_top_daily_scores", lambda: db.get_top_daily_scores(limit=5)),
+        ("insert_user_statistics_batch 20", lambda: db.insert_user_statistics_batch(
+            [(rng.randrange(1, 1001), 0, rng.uniform(20, 140), 95.0, 30.0, now) for _ in range(20)])),
+    ]
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare the timings with a saved baseline. The fastest repetition is compared, as it is the least
+    affected by other work on the machine.
+
+    Args:
+        results (dict): The timings of this run by benchmark name.
+        baseline (dict): The timings of the baseline by benchmark name.
+        threshold (float): The relative change that counts as a regression or an improvement, e.g. 0.1.
+
+    Returns:
+        list: The names of the benchmarks that got slower than the threshold allows.
+    """
+    regressions = []
+    print("\n{:<40} {:>12} {:>12} {:>9}".format("benchmark", "baseline min", "current min", "change"))
+    for name, result in results.items():
+        if name not in baseline:
+            print("{:<40} {:>12} {:>12.2f} {:>9}".format(name, "-", result["min_us"], "new"))
+            continue
+        before = baseline[name]["min_us"]
+        change = (result["min_us"] - before) / before if before else 0
+        verdict = ""
+        if change > threshold:
+            verdict = " slower"
+            regressions.append(name)
+        elif change < -threshold:
+            verdict = " faster"
+        print("{:<40} {:>12.2f} {:>12.2f} {:>+8.1%}{}".format(name, before, result["min_us"], change, verdict))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the hot paths of SlaveType.")
+    parser.add_argument("--filter", help="Only run the benchmarks whose name contains this text.")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed repetitions per benchmark.")
+    parser.add_argument("--sqlite", default=":memory:", help="SQLite database for the query benchmarks, seeded if "
+                                                               "empty. Defaults to an in-memory database.")
+    parser.add_argument("--save", help="Write the timings to this baseline file.")
+    parser.add_argument("--compare", help="Compare the timings with this baseline file.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported as a regression.")
+    args = parser.parse_args()
+
+    sqlite_path = args.sqlite if args.sqlite == ":memory:" else os.path.abspath(args.sqlite)
+    from src.Game import SlaveType
+    from src.SQLiteDB import SQLiteDatabase
+
+    db = SQLiteDatabase(sqlite_path)
+    started = time.perf_counter()
+    seed_database(db)
+    print("Database ready in {:.1f} s".format(time.perf_counter() - started))
+    game = SlaveType(db=db, headless=True)
+    game.show_login_screen = False
+
+    results = {}
+    print("{:<40} {:>12} {:>12} {:>10}".format("benchmark", "median us", "min us", "loops"))
+    for name, fn in game_benchmarks(game) + database_benchmarks(db):
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(fn, repeat=args.repeat)
+        print("{:<40} {:>12.2f} {:>12.2f} {:>10}".format(name, results[name]["median_us"], results[name]["min_us"],
+                                                       results[name]["loops"]))
+    game.shutdown()
+
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                      baseline_file, indent=4)
+    if args.compare:
+        with open(args.compare, "r") as baseline_file:
+            regressions = compare(results, json.load(baseline_file)["results"], args.threshold)
+        if regressions:
+            print("\n{} benchmark(s) slower than the baseline: {}".format(len(regressions), ", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
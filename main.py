@@ -1,4 +1,6 @@
+from src.utils.StartupTimer import startup_timer
 from src.Game import SlaveType
 
+startup_timer.mark("import")
 game = SlaveType()
 game.run()
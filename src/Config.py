@@ -0,0 +1,57 @@
+import functools
+import json
+import os
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(PACKAGE_DIR)
+CONFIG_DIR = os.path.join(ROOT_DIR, "config")
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+
+
+def resolve_path(path):
+    """
+    Resolve a path from a configuration file. Relative paths are relative to the src directory, as they were
+    when the game had to be started from there, so the game now works from any working directory.
+
+    Args:
+        path (str or None): The configured path.
+
+    Returns:
+        str or None: The absolute path, None if no path is configured. ":memory:" is kept as it is.
+    """
+    if path is None or path == ":memory:" or os.path.isabs(path):
+        return path
+    return os.path.normpath(os.path.join(PACKAGE_DIR, path))
+
+
+def asset_path(*parts):
+    """
+    Return the absolute path of a file in the assets directory.
+    """
+    return os.path.join(ASSETS_DIR, *parts)
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(name="config.json"):
+    """
+    Read a configuration file from the config directory. Every file is read once, on first use.
+
+    Args:
+        name (str, optional): The file name. Defaults to "config.json".
+
+    Returns:
+        dict: The configuration. Callers must not modify it.
+    """
+    with open(os.path.join(CONFIG_DIR, name), "r") as config_file:
+        return json.load(config_file)
+
+
+def load_db_config():
+    """
+    Read the database configuration, only needed when the game creates its own database backend. The SQLite
+    path is resolved here, the backends take paths as they are given.
+    """
+    db_config = dict(load_config("db_config.json"))
+    if db_config.get("backend") == "sqlite":
+        db_config["sqlite_path"] = resolve_path(db_config.get("sqlite_path", "../data/slavetype.db"))
+    return db_config
@@ -1,34 +1,262 @@
 import datetime
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from contextlib import contextmanager
+
+
+def mysql_connector():
+    """
+    Import mysql.connector on first use. It is slow to import and not needed before the first connection is
+    opened on the database worker, nor at all by the SQLite backend.
+    """
+    import mysql.connector
+    return mysql.connector
+
+
+class ConnectionPool:
+    def __init__(self, connection_config, size=1, ping_interval=30, acquire_timeout=60):
+        """
+        Initialize a pool of database connections that are created lazily and only pinged after being idle.
 
-import mysql.connector
+        Parameters:
+            connection_config (dict): The keyword arguments passed to mysql.connector.connect.
+            size (int, optional): The maximum number of open connections. Defaults to 1.
+            ping_interval (float, optional): The number of seconds a connection may be idle before it is pinged
+                (and reconnected if needed) on its next use. Defaults to 30.
+            acquire_timeout (float, optional): The number of seconds acquire waits for a connection before it
+                gives up. Defaults to 60.
+        """
+        self.connection_config = connection_config
+        self.size = size
+        self.ping_interval = ping_interval
+        self.acquire_timeout = acquire_timeout
+        self.idle = queue.LifoQueue()
+        self.connections = []
+        self.last_used = {}
+        self.cursors = {}
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a connection from the pool, opening a new one if none is idle and the pool is not full, otherwise
+        waiting for one to be released or discarded.
 
+        A connection that cannot be pinged or reconnected is closed and dropped from the pool, so the next call
+        opens a new one once the database is back.
 
-class Database:
-    def __init__(self, host, user, passwd, dbname):
-        """
-        Initializes a new instance of the class with the specified database connection parameters.
+        Returns:
+            The connection, pinged first if it was idle for longer than the ping interval.
 
-        :param host: The host of the database.
-        :param user: The username for the database connection.
-        :param passwd: The password for the database connection.
-        :param dbname: The name of the database to connect to.
+        Raises:
+            TimeoutError: No connection became available within the acquire timeout.
         """
-        self.db = mysql.connector.connect(
-            host=host,
-            user=user,
-            passwd=passwd,
-            database=dbname
-        )
+        connection = self.take_connection()
+        if time.monotonic() - self.last_used[id(connection)] > self.ping_interval:
+            try:
+                self.ping(connection)
+            except Exception:
+                self.discard(connection)
+                raise
+        return connection
+
+    def take_connection(self):
+        """
+        Return an idle connection or a new one, waiting up to the acquire timeout while the pool is full.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                if len(self.connections) < self.size:
+                    connection = mysql_connector().connect(**self.connection_config)
+                    self.connections.append(connection)
+                    self.last_used[id(connection)] = time.monotonic()
+                    return connection
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("No database connection became available within {} seconds".format(
+                    self.acquire_timeout))
+            try:
+                # Woken up at least every second, a discarded connection frees a place without a release
+                return self.idle.get(timeout=min(remaining, 1))
+            except queue.Empty:
+                pass
+
+    def discard(self, connection):
+        """
+        Close a connection that could not be reconnected and drop it from the pool.
+        """
+        with self.lock:
+            if connection in self.connections:
+                self.connections.remove(connection)
+            self.last_used.pop(id(connection), None)
+            cursor = self.cursors.pop(id(connection), None)
+        try:
+            if cursor is not None:
+                cursor.close()
+            connection.close()
+        except Exception:
+            pass
 
-    def ensure_connection(self):
+    def ping(self, connection):
         """
-        Ensure the database connection by pinging the database and reconnecting if the connection is lost.
+        Ping the connection and reconnect if the connection is lost. The cached cursor is dropped because it
+        belongs to the old session.
         """
+        self.cursors.pop(id(connection), None)
         try:
-            self.db.ping(reconnect=True, attempts=3, delay=5)
-        except mysql.connector.Error:
+            connection.ping(reconnect=True, attempts=3, delay=5)
+        except mysql_connector().Error:
             print("Database connection lost. Trying to reconnect...")
-            self.db.reconnect(attempts=3, delay=5)
+            connection.reconnect(attempts=3, delay=5)
+
+    def cursor(self, connection):
+        """
+        Return the buffered cursor of the connection, creating it on first use so it is reused by later calls.
+        """
+        cursor = self.cursors.get(id(connection))
+        if cursor is None:
+            cursor = connection.cursor(buffered=True)
+            self.cursors[id(connection)] = cursor
+        return cursor
+
+    def release(self, connection, broken=False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            connection: The connection taken with acquire.
+            broken (bool, optional): Whether the last call failed. The connection is then pinged on its next
+                use. Defaults to False.
+
+        Returns:
+            None
+        """
+        self.last_used[id(connection)] = 0 if broken else time.monotonic()
+        self.idle.put(connection)
+
+    def close(self):
+        """
+        Close every connection of the pool.
+        """
+        with self.lock:
+            for cursor in self.cursors.values():
+                cursor.close()
+            for connection in self.connections:
+                connection.close()
+            self.cursors.clear()
+            self.connections.clear()
+            self.last_used.clear()
+            self.idle = queue.LifoQueue()
+
+
+class DatabaseBackend(ABC):
+    """
+    The database interface used by the game. The queries shared by all backends are written with "%s"
+    placeholders; a backend provides the connections, its schema and the statements that differ between
+    SQL dialects.
+    """
+
+    def __init__(self):
+        """
+        Initializes the state shared by all backends.
+        """
+        self.pool_size = 1
+        self.sentence_ids = {}
+        self.schema_checked = False
+        self.schema_checking = False
+        self.schema_lock = threading.RLock()
+
+    @abstractmethod
+    def connection(self):
+        """
+        Context manager yielding a (connection, cursor) tuple for the duration of a call.
+        """
+
+    @abstractmethod
+    def ensure_schema(self):
+        """
+        Make sure the tables used by the application exist.
+        """
+
+    @abstractmethod
+    def update_best_scores(self, cursor, rows):
+        """
+        Keep the best score tables up to date with new results, in the transaction of the insert.
+        """
+
+    @abstractmethod
+    def close(self):
+        """
+        Closes the database connections.
+        """
+
+    def check_schema(self):
+        """
+        Run ensure_schema once, before the first call that needs a connection.
+
+        Other threads wait until the schema is ready. The schema only counts as checked once ensure_schema
+        succeeded, so a failed check, e.g. while the database is offline at startup, is repeated by the next
+        call. The calls ensure_schema makes itself run while the lock is held and skip the check.
+        """
+        if self.schema_checked:
+            return
+        with self.schema_lock:
+            if self.schema_checked or self.schema_checking:
+                return
+            self.schema_checking = True
+            try:
+                self.ensure_schema()
+                self.schema_checked = True
+            finally:
+                self.schema_checking = False
+
+    def ensure_connection(self):
+        """
+        Ensure a database connection is available, pinging it and reconnecting if the connection was idle for
+        longer than the ping interval.
+        """
+        with self.connection():
+            pass
+
+    def rebuild_best_scores(self):
+        """
+        Recalculate the best score tables from the whole UserStatistics history using window functions.
+        """
+        with self.connection() as (db, cursor):
+            cursor.execute("DELETE FROM UserBestScores")
+            cursor.execute("DELETE FROM UserDailyBestScores")
+            cursor.execute("""
+                INSERT INTO UserBestScores (user_id, wpm, accuracy, date_played)
+                SELECT user_id, wpm, accuracy, date_played
+                FROM (
+                    SELECT user_id, wpm, accuracy, date_played,
+                           ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY wpm DESC, date_played) AS position
+                    FROM UserStatistics
+                    WHERE user_id IS NOT NULL
+                ) ranked
+                WHERE position = 1
+            """)
+            cursor.execute("""
+                INSERT INTO UserDailyBestScores (user_id, day, wpm, accuracy, date_played)
+                SELECT user_id, DATE(date_played), wpm, accuracy, date_played
+                FROM (
+                    SELECT user_id, wpm, accuracy, date_played,
+                           ROW_NUMBER() OVER (PARTITION BY user_id, DATE(date_played)
+                                              ORDER BY wpm DESC, date_played) AS position
+                    FROM UserStatistics
+                    WHERE user_id IS NOT NULL
+                ) ranked
+                WHERE position = 1
+            """)
+            db.commit()
 
     def insert_sentence(self, sentence):
         """
@@ -41,13 +269,49 @@ class Database:
         Returns:
             None
         """
-        self.ensure_connection()
-        word_count = len(sentence.split())
-        cursor = self.db.cursor()
-        query = "INSERT INTO sentences (sentence, word_count) VALUES (%s, %s)"
-        cursor.execute(query, (sentence, word_count))
-        self.db.commit()
-        cursor.close()
+        self.insert_sentences([(sentence, len(sentence.split()))])
+
+    def insert_sentences(self, rows):
+        """
+        Inserts several sentences with executemany in a single transaction.
+
+        Parameters:
+            rows (list): Tuples of (sentence, word_count).
+
+        Returns:
+            int: The number of inserted sentences.
+        """
+        if not rows:
+            return 0
+        with self.connection() as (db, cursor):
+            query = "INSERT INTO sentences (sentence, word_count) VALUES (%s, %s)"
+            cursor.executemany(query, rows)
+            db.commit()
+        for word_count in {word_count for sentence, word_count in rows}:
+            self.sentence_ids.pop(word_count, None)
+        return len(rows)
+
+    def iter_sentences(self, batch_size=10000):
+        """
+        Yields every stored sentence, reading them in batches of batch_size rows.
+
+        Parameters:
+            batch_size (int, optional): The number of rows fetched at once. Defaults to 10000.
+
+        Yields:
+            str: The stored sentences.
+        """
+        last_id = 0
+        while True:
+            with self.connection() as (db, cursor):
+                query = "SELECT id, sentence FROM sentences WHERE id > %s ORDER BY id LIMIT %s"
+                cursor.execute(query, (last_id, batch_size))
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            for sentence_id, sentence in rows:
+                yield sentence
+            last_id = rows[-1][0]
 
     def get_random_sentence_by_word_count(self, count):
         """
@@ -59,13 +323,57 @@ class Database:
         Returns:
             str or None: The randomly selected sentence with the specified word count, or None if no such sentence is found.
         """
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = "SELECT sentence FROM sentences WHERE word_count = %s ORDER BY RAND() LIMIT 1"
-        cursor.execute(query, (count,))
-        sentence = cursor.fetchone()
-        cursor.close()
-        return sentence[0] if sentence else None
+        sentences = self.get_random_sentences_by_word_count(count, 1)
+        return sentences[0] if sentences else None
+
+    def get_sentence_ids_by_word_count(self, count):
+        """
+        Retrieves the ids of all sentences with the specified word count. The ids are cached per word count
+        until a sentence with that word count is inserted.
+
+        Args:
+            count (int): The word count of the sentences.
+
+        Returns:
+            array: The ids of the matching sentences.
+        """
+        ids = self.sentence_ids.get(count)
+        if ids is None:
+            with self.connection() as (db, cursor):
+                query = "SELECT id FROM sentences WHERE word_count = %s"
+                cursor.execute(query, (count,))
+                ids = array("q", (row[0] for row in cursor.fetchall()))
+            self.sentence_ids[count] = ids
+        return ids
+
+    def get_random_sentences_by_word_count(self, count, amount):
+        """
+        Retrieves up to the given amount of distinct random sentences with the specified word count.
+
+        Instead of sorting every matching row with ORDER BY RAND(), random ids are picked from the cached id
+        list and looked up by primary key.
+
+        Args:
+            count (int): The word count of the desired sentences.
+            amount (int): The number of sentences to retrieve.
+
+        Returns:
+            list: The randomly selected sentences, empty if no sentence has the specified word count.
+        """
+        ids = self.get_sentence_ids_by_word_count(count)
+        if not ids:
+            return []
+        chosen_ids = random.sample(ids, min(amount, len(ids)))
+
+        with self.connection() as (db, cursor):
+            query = "SELECT sentence FROM sentences WHERE id IN ({})".format(", ".join(["%s"] * len(chosen_ids)))
+            cursor.execute(query, tuple(chosen_ids))
+            sentences = [row[0] for row in cursor.fetchall()]
+        if len(sentences) < len(chosen_ids):
+            # Some sentences were deleted since the ids were cached
+            self.sentence_ids.pop(count, None)
+        random.shuffle(sentences)
+        return sentences
 
     def insert_user(self, username, password):
         """
@@ -73,16 +381,15 @@ class Database:
 
         :param username: the username of the new user
         :param password: the password of the new user
-        :return: None
+        :return: True if the user was inserted, False if the username or password is missing
         """
         if username is None or password is None:
             return False
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = "INSERT INTO users (username, password) values (%s, %s)"
-        cursor.execute(query, (username, password))
-        self.db.commit()
-        cursor.close()
+        with self.connection() as (db, cursor):
+            query = "INSERT INTO users (username, password) values (%s, %s)"
+            cursor.execute(query, (username, password))
+            db.commit()
+        return True
 
     def insert_user_statistics(self, user_id: int, game_id: int, wpm: float, accuracy: float,
                                play_time: int):
@@ -99,16 +406,30 @@ class Database:
         Returns:
             None
         """
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = """
-            INSERT INTO UserStatistics (user_id, game_id, wpm, accuracy, play_time, date_played)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """
         date_played = datetime.datetime.now()  # Current date and time
-        cursor.execute(query, (user_id, game_id, wpm, accuracy, play_time, date_played))
-        self.db.commit()
-        cursor.close()
+        self.insert_user_statistics_batch([(user_id, game_id, wpm, accuracy, play_time, date_played)])
+
+    def insert_user_statistics_batch(self, rows):
+        """
+        Inserts the statistics of several games in a single transaction.
+
+        Parameters:
+            rows (list): Tuples of (user_id, game_id, wpm, accuracy, play_time, date_played), where date_played
+                is a datetime.datetime.
+
+        Returns:
+            None
+        """
+        if not rows:
+            return
+        with self.connection() as (db, cursor):
+            query = """
+                INSERT INTO UserStatistics (user_id, game_id, wpm, accuracy, play_time, date_played)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """
+            cursor.executemany(query, rows)
+            self.update_best_scores(cursor, [row for row in rows if row[0] is not None])
+            db.commit()
 
     def get_user_id_by_username(self, username):
         """
@@ -120,12 +441,10 @@ class Database:
         Returns:
             int or None: The user id if found, otherwise None.
         """
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = "SELECT id FROM Users WHERE username = %s"
-        cursor.execute(query, (username,))
-        user_id = cursor.fetchone()
-        cursor.close()
+        with self.connection() as (db, cursor):
+            query = "SELECT id FROM Users WHERE username = %s"
+            cursor.execute(query, (username,))
+            user_id = cursor.fetchone()
         return user_id[0] if user_id else None
 
     def verify_user_credentials(self, username, password):
@@ -141,14 +460,37 @@ class Database:
         """
         if not username or not password:
             return False
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = "SELECT id FROM users WHERE username = %s AND password = %s"
-        cursor.execute(query, (username, password))
-        result = cursor.fetchone()
-        cursor.close()
+        with self.connection() as (db, cursor):
+            query = "SELECT id FROM users WHERE username = %s AND password = %s"
+            cursor.execute(query, (username, password))
+            result = cursor.fetchone()
         return result[0] if result else False
 
+    def authenticate_user(self, username, password):
+        """
+        Verify user credentials and read the best WPM of the user in the same query.
+
+        Args:
+            username (str): The username of the user.
+            password (str): The password of the user.
+
+        Returns:
+            tuple or None: The user ID and the best WPM (None without a result yet) if the credentials are
+            valid, None otherwise.
+        """
+        if not username or not password:
+            return None
+        with self.connection() as (db, cursor):
+            query = """
+                SELECT u.id, b.wpm
+                FROM users u
+                LEFT JOIN UserBestScores b ON b.user_id = u.id
+                WHERE u.username = %s AND u.password = %s
+            """
+            cursor.execute(query, (username, password))
+            result = cursor.fetchone()
+        return (result[0], result[1]) if result else None
+
     def check_user_credentials(self, username, password):
         """
         Check user credentials.
@@ -161,12 +503,10 @@ class Database:
         Returns:
             bool: True if the username and password match, False otherwise.
         """
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = "SELECT password FROM Users WHERE username = %s"
-        cursor.execute(query, (username,))
-        stored_password = cursor.fetchone()
-        cursor.close()
+        with self.connection() as (db, cursor):
+            query = "SELECT password FROM Users WHERE username = %s"
+            cursor.execute(query, (username,))
+            stored_password = cursor.fetchone()
         return stored_password and stored_password[0] == password
 
     def create_user_account(self, username, password):
@@ -187,67 +527,191 @@ class Database:
         """
         Retrieves the top scores from the database.
 
+        The scores are read from UserBestScores, which holds the best result of every user, so the query cost
+        does not grow with the UserStatistics history.
+
         :param limit: int, the maximum number of scores to retrieve (default is 10)
         :return: list, a list of top scores including username, the best wpm, accuracy, and date played
         """
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = """
-            SELECT u.username, s.wpm AS best_wpm, s.accuracy, s.date_played
-            FROM Users u
-            JOIN (
-                SELECT user_id, wpm, accuracy, date_played
-                FROM UserStatistics
-                WHERE (user_id, wpm, date_played) IN (
-                    SELECT user_id, MAX(wpm), date_played
-                    FROM UserStatistics
-                    GROUP BY user_id, DATE(date_played)
-                )
-            ) s ON u.id = s.user_id
-            ORDER BY s.wpm DESC
-            LIMIT %s;
-
-        """
-        cursor.execute(query, (limit,))
-        scores = cursor.fetchall()
-        cursor.close()
+        with self.connection() as (db, cursor):
+            query = """
+                SELECT u.username, b.wpm AS best_wpm, b.accuracy, b.date_played
+                FROM UserBestScores b
+                JOIN Users u ON u.id = b.user_id
+                ORDER BY b.wpm DESC
+                LIMIT %s
+            """
+            cursor.execute(query, (limit,))
+            scores = cursor.fetchall()
         return scores
 
     def get_top_daily_scores(self, limit=10):
         """
         Get the top daily scores from the database.
 
+        The scores are read from UserDailyBestScores with an indexed equality on the day, so the query cost does
+        not grow with the UserStatistics history.
+
         Parameters:
             limit (int): The maximum number of scores to return. Defaults to 10.
 
         Returns:
             list: A list of tuples containing the top daily scores, each tuple containing the username, the best wpm, accuracy, and date played.
         """
-        self.ensure_connection()
-        cursor = self.db.cursor()
-        query = """
-            SELECT u.username, s.wpm AS best_wpm, s.accuracy, s.date_played
-            FROM Users u
-            JOIN (
-                SELECT user_id, wpm, accuracy, date_played
-                FROM UserStatistics
-                WHERE (user_id, wpm, date_played) IN (
-                    SELECT user_id, MAX(wpm), date_played
-                    FROM UserStatistics
-                    WHERE DATE(date_played) = CURDATE()
-                    GROUP BY user_id, DATE(date_played)
+        with self.connection() as (db, cursor):
+            query = """
+                SELECT u.username, b.wpm AS best_wpm, b.accuracy, b.date_played
+                FROM UserDailyBestScores b
+                JOIN Users u ON u.id = b.user_id
+                WHERE b.day = %s
+                ORDER BY b.wpm DESC
+                LIMIT %s
+            """
+            cursor.execute(query, (datetime.date.today(), limit))
+            scores = cursor.fetchall()
+        return scores
+
+
+class Database(DatabaseBackend):
+    def __init__(self, host, user, passwd, dbname, pool_size=1, ping_interval=30):
+        """
+        Initializes a new MySQL backend with the specified database connection parameters.
+
+        No connection is opened until the first query.
+
+        :param host: The host of the database.
+        :param user: The username for the database connection.
+        :param passwd: The password for the database connection.
+        :param dbname: The name of the database to connect to.
+        :param pool_size: The maximum number of connections, more than one lets several threads query at once.
+        :param ping_interval: The number of seconds a connection may be idle before it is pinged on its next use.
+        """
+        super().__init__()
+        self.pool_size = pool_size
+        self.pool = ConnectionPool(
+            dict(host=host, user=user, passwd=passwd, database=dbname),
+            size=pool_size,
+            ping_interval=ping_interval
+        )
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection from the pool for the duration of a call.
+
+        The schema is checked once before the first call. A failed call is rolled back and its connection is
+        pinged on its next use.
+
+        Yields:
+            tuple: The connection and its reusable cursor.
+        """
+        self.check_schema()
+
+        connection = self.pool.acquire()
+        try:
+            yield connection, self.pool.cursor(connection)
+        except Exception:
+            try:
+                connection.rollback()
+            except mysql_connector().Error:
+                pass
+            self.pool.release(connection, broken=True)
+            raise
+        else:
+            self.pool.release(connection)
+
+    def ensure_schema(self):
+        """
+        Make sure the tables maintained by the application exist.
+        """
+        self.ensure_best_score_tables()
+
+    def ensure_best_score_tables(self):
+        """
+        Create the tables holding the best score of every user and the best score of every user per day if they
+        do not exist yet, and fill them from UserStatistics when they are empty.
+        """
+        with self.connection() as (db, cursor):
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS UserBestScores (
+                    user_id INT PRIMARY KEY,
+                    wpm FLOAT NOT NULL,
+                    accuracy FLOAT NOT NULL,
+                    date_played DATETIME NOT NULL,
+                    INDEX idx_best_wpm (wpm)
                 )
-            ) s ON u.id = s.user_id
-            ORDER BY s.wpm DESC
-            LIMIT %s;
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS UserDailyBestScores (
+                    user_id INT NOT NULL,
+                    day DATE NOT NULL,
+                    wpm FLOAT NOT NULL,
+                    accuracy FLOAT NOT NULL,
+                    date_played DATETIME NOT NULL,
+                    PRIMARY KEY (user_id, day),
+                    INDEX idx_daily_best_day_wpm (day, wpm)
+                )
+            """)
+            cursor.execute("SELECT 1 FROM UserBestScores LIMIT 1")
+            has_best_scores = cursor.fetchone() is not None
+            cursor.execute("SELECT 1 FROM UserStatistics LIMIT 1")
+            has_statistics = cursor.fetchone() is not None
+            db.commit()
+        if has_statistics and not has_best_scores:
+            self.rebuild_best_scores()
+
+    @staticmethod
+    def update_best_scores(cursor, rows):
         """
-        cursor.execute(query, (limit,))
-        scores = cursor.fetchall()
-        cursor.close()
-        return scores
+        Keep the best score tables up to date with new results, in the transaction of the insert, using
+        MySQL's ON DUPLICATE KEY UPDATE.
+
+        Parameters:
+            cursor: The cursor of the running transaction.
+            rows (list): Tuples of (user_id, game_id, wpm, accuracy, play_time, date_played) of known users.
+        """
+        if not rows:
+            return
+        # The wpm column is assigned last, so the conditions above still see the previous best
+        update = """
+            ON DUPLICATE KEY UPDATE
+                accuracy = IF(VALUES(wpm) > wpm, VALUES(accuracy), accuracy),
+                date_played = IF(VALUES(wpm) > wpm, VALUES(date_played), date_played),
+                wpm = GREATEST(wpm, VALUES(wpm))
+        """
+        cursor.executemany("""
+            INSERT INTO UserBestScores (user_id, wpm, accuracy, date_played)
+            VALUES (%s, %s, %s, %s)
+        """ + update, [(user_id, wpm, accuracy, date_played)
+                       for user_id, game_id, wpm, accuracy, play_time, date_played in rows])
+        cursor.executemany("""
+            INSERT INTO UserDailyBestScores (user_id, day, wpm, accuracy, date_played)
+            VALUES (%s, %s, %s, %s, %s)
+        """ + update, [(user_id, date_played.date(), wpm, accuracy, date_played)
+                       for user_id, game_id, wpm, accuracy, play_time, date_played in rows])
 
     def close(self):
         """
-        Closes the database connection.
+        Closes the database connections.
         """
-        self.db.close()
+        self.pool.close()
+
+
+def create_database(config):
+    """
+    Create the database backend selected by the "backend" entry of the database configuration.
+
+    Args:
+        config (dict): The database configuration. "backend" is "mysql" (the default) or "sqlite", the other
+            entries are passed to the backend.
+
+    Returns:
+        DatabaseBackend: The database backend.
+    """
+    config = dict(config)
+    backend = config.pop("backend", "mysql")
+    if backend == "sqlite":
+        from src.SQLiteDB import SQLiteDatabase
+        return SQLiteDatabase(path=config.get("sqlite_path", "../data/slavetype.db"))
+    config.pop("sqlite_path", None)
+    return Database(**config)
@@ -1,17 +1,33 @@
+import os
 import time
 import sys
 import pygame
-import json
 from src import DB
+from src.Config import asset_path, load_config, load_db_config, resolve_path
+from src.utils.DBWorker import DBWorker, report_exception
 from src.utils.DifficultyButtons import DifficultyButton
+from src.utils.DirtyRects import DirtyRectTracker
+from src.utils.FontRegistry import get_font
+from src.utils.FramePacer import FramePacer
+from src.utils.GlyphAtlas import glyph_atlas
+from src.utils.FrameProfiler import FrameProfiler
+from src.utils.KeystrokeRecorder import KeystrokeRecorder
+from src.utils.LeaderboardCache import LeaderboardCache
+from src.utils.LocalCorpus import LocalCorpus
+from src.utils.PrefixWidths import PrefixWidths
 from src.utils.RestartButton import RestartButton
+from src.utils.SentencePrefetcher import SentencePrefetcher
+from src.utils.Session import Session
+from src.utils.StartupTimer import startup_timer
+from src.utils.StatisticsTracker import StatisticsTracker
+from src.utils.StatisticsWriter import StatisticsWriter
+from src.utils.SurfaceCache import surface_cache
 from src.utils.TextButton import TextButton
+from src.utils.TextLayout import text_layout
+from src.utils.TextViewport import TextViewport
+from src.utils.Toast import ToastManager
 
-with open('../config/db_config.json', 'r') as config_file:
-    db_config = json.load(config_file)
-
-with open("../config/config.json") as config_file:
-    config = json.load(config_file)
+config = load_config()
 
 SCREEN_WIDTH = config["SCREEN_WIDTH"]
 SCREEN_HEIGHT = config["SCREEN_HEIGHT"]
@@ -25,8 +41,31 @@ Positions = [
 ]
 # Ensure that this list comprehension is used wherever STATISTICS_POSITIONS is defined or updated.
 STATISTICS_POSITIONS = [(int(SCREEN_HEIGHT * pos["y"]), pos["template"]) for pos in Positions]
-print(STATISTICS_POSITIONS)
 FPS = config["FPS"]
+RENDER_MODE = config.get("RENDER_MODE", "full")
+FRAME_PACING = config.get("FRAME_PACING", {"MODE": "fixed"})
+FRAME_PROFILER = config.get("FRAME_PROFILER", {})
+LONG_TEXT = config.get("LONG_TEXT", {})
+LONG_TEXT_WORD_COUNTS = tuple(LONG_TEXT.get("WORD_COUNTS", [200, 500, 1000]))
+LONG_TEXT_VISIBLE_LINES = LONG_TEXT.get("VISIBLE_LINES", 3)
+DEBUG_STATISTICS = config.get("DEBUG_STATISTICS", False)
+KEYSTROKE_LOG_DIR = resolve_path(config.get("KEYSTROKE_LOG_DIR"))
+SENTENCE_BUFFER_SIZE = config.get("SENTENCE_BUFFER_SIZE", 5)
+SENTENCE_SOURCE = config.get("SENTENCE_SOURCE", "database")
+LOCAL_CORPUS_PATH = resolve_path(config.get("LOCAL_CORPUS_PATH"))
+LEADERBOARD_TTL = config.get("LEADERBOARD_TTL", 30)
+STATISTICS_SPOOL_PATH = resolve_path(config.get("STATISTICS_SPOOL_PATH", "../data/statistics_spool.jsonl"))
+STATISTICS_BATCH_SIZE = config.get("STATISTICS_BATCH_SIZE", 20)
+STATISTICS_FLUSH_INTERVAL = config.get("STATISTICS_FLUSH_INTERVAL", 5)
+BACKGROUND_COLOR = (12, 22, 24, 255)
+HIGHLIGHT_COLOR = (255, 215, 0)
+PENDING_TEXT_COLOR = (0, 153, 51)
+CORRECT_TEXT_COLOR = (0, 255, 0)
+INCORRECT_TEXT_COLOR = (255, 69, 58)
+REPORT_STARTUP = config.get("REPORT_STARTUP", False)
+BOLD_FONT_PATH = asset_path("fonts", "Roboto-Bold.ttf")
+MEDIUM_FONT_PATH = asset_path("fonts", "Roboto-Medium.ttf")
+RESTART_IMAGE_PATH = asset_path("images", "restart.png")
 
 
 def get_text_width(text, font_size=FONT_SIZE):
@@ -40,9 +79,8 @@ def get_text_width(text, font_size=FONT_SIZE):
     Returns:
         int: The width of the rendered text in pixels.
     """
-    font = pygame.font.Font("../assets/fonts/Roboto-Bold.ttf", font_size)
-    text_surface = font.render(text, True, TEXT_COLOR)
-    return text_surface.get_width()
+    font = get_font(BOLD_FONT_PATH, font_size)
+    return font.size(text)[0]
 
 
 def update_positions_based_on_size(screen_width, screen_height):
@@ -63,28 +101,70 @@ def update_positions_based_on_size(screen_width, screen_height):
 
 
 class SlaveType:
-    def __init__(self):
+    def __init__(self, db=None, headless=False):
         """
         Constructor for initializing various attributes and objects.
+
+        Parameters:
+            db (DatabaseBackend, optional): The database to use. Defaults to None (the backend configured in
+                db_config.json).
+            headless (bool, optional): Render with SDL's dummy video driver, for machines without a screen.
+                Defaults to False.
         """
+        if headless:
+            # Must be set before pygame initializes its video and audio subsystems
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        # Open the window before anything else, so it appears while the rest starts up
+        pygame.init()
+        startup_timer.mark("pygame.init")
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+        self.screen.fill(BACKGROUND_COLOR)
+        pygame.display.flip()
+        startup_timer.mark("window")
+
         self.already_one_time_clicked = False
         self.show_signup_screen = None
-        self.db = DB.Database(**db_config)
+        # Creating a backend does not connect, the first connection is opened on the database worker
+        self.db = db if db is not None else DB.create_database(load_db_config())
+        self.frame_profiler = FrameProfiler.from_config(FRAME_PROFILER)
+        self.db_worker = DBWorker(max_workers=self.db.pool_size,
+                                  profiler=self.frame_profiler if self.frame_profiler.enabled else None)
+        self.db_worker.submit(self.db.ensure_connection).add_done_callback(report_exception)
+        if SENTENCE_SOURCE == "local":
+            self.sentence_source = LocalCorpus.open(LOCAL_CORPUS_PATH)
+        else:
+            self.sentence_source = self.db
+        self.sentence_prefetcher = SentencePrefetcher(self.sentence_source, self.db_worker,
+                                                      buffer_size=SENTENCE_BUFFER_SIZE,
+                                                      long_word_counts=LONG_TEXT_WORD_COUNTS)
+        self.sentence_prefetcher.prime()
+        self.requested_word_count = 50
+        self.login_future = None
+        self.session = None
+        self.login_toast = None
+        self.signup_toast = None
+        self.toasts = ToastManager(font_path=MEDIUM_FONT_PATH)
+        self.signup_future = None
+        self.leaderboard_cache = LeaderboardCache(self.fetch_leaderboard, self.db_worker, ttl=LEADERBOARD_TTL)
+        self.statistics_writer = StatisticsWriter(self.db, self.db_worker, STATISTICS_SPOOL_PATH,
+                                                  batch_size=STATISTICS_BATCH_SIZE,
+                                                  flush_interval=STATISTICS_FLUSH_INTERVAL,
+                                                  on_flushed=self.leaderboard_cache.invalidate)
         self.game_id = 0
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+        startup_timer.mark("database")
         self.restart_button = RestartButton(
             (SCREEN_WIDTH // 2 - RESTART_BUTTON_SIZE // 2, SCREEN_HEIGHT // 2 + 60),
             RESTART_BUTTON_SIZE,
             RESTART_BUTTON_SIZE,
-            "../assets/images/restart.png",
+            RESTART_IMAGE_PATH,
             (0, 100, 0)
         )
         self.back_button = TextButton(position=(SCREEN_WIDTH // 2 - 60, SCREEN_HEIGHT * 0.8),
                                       width=120,
                                       height=40,
                                       text="Back",
-                                      font_path="../assets/fonts/Roboto-Bold.ttf",
+                                      font_path=BOLD_FONT_PATH,
                                       font_size=25,
                                       text_color=(255, 255, 255),
                                       background_color=(12, 22, 24, 255),
@@ -93,7 +173,7 @@ class SlaveType:
                                              width=120,
                                              height=40,
                                              text="Leaderboard",
-                                             font_path="../assets/fonts/Roboto-Bold.ttf",
+                                             font_path=BOLD_FONT_PATH,
                                              font_size=20,
                                              text_color=(255, 255, 255),
                                              background_color=(12, 22, 24, 255),
@@ -101,22 +181,34 @@ class SlaveType:
                                              is_leaderboard_button=True)
         self.leaderboard_button.visible = True
         self.difficulty_button_10 = TextButton(position=(SCREEN_WIDTH // 2 + 30, SCREEN_HEIGHT * 0.01), width=50,
-                                               height=40, text="10", font_path="../assets/fonts/Roboto-Bold.ttf", font_size=30,
+                                               height=40, text="10", font_path=BOLD_FONT_PATH, font_size=30,
                                                text_color=(255, 255, 255),
                                                background_color=(12, 22, 24, 255),
                                                hover_background_color=(150, 150, 150))
         self.difficulty_button_10.visible = True
         self.difficulty_button_20 = TextButton(position=(SCREEN_WIDTH // 2 - 30, SCREEN_HEIGHT * 0.01), width=50,
-                                               height=40, text="20", font_path="../assets/fonts/Roboto-Bold.ttf", font_size=30,
+                                               height=40, text="20", font_path=BOLD_FONT_PATH, font_size=30,
                                                text_color=(255, 255, 255),
                                                background_color=(12, 22, 24, 255),
                                                hover_background_color=(150, 150, 150))
         self.difficulty_button_50 = TextButton(position=(SCREEN_WIDTH // 2 - 90, SCREEN_HEIGHT * 0.01), width=50,
-                                               height=40, text="50", font_path="../assets/fonts/Roboto-Bold.ttf", font_size=30,
+                                               height=40, text="50", font_path=BOLD_FONT_PATH, font_size=30,
                                                text_color=(255, 255, 255),
                                                background_color=(12, 22, 24, 255),
                                                hover_background_color=(150, 150, 150))
         self.difficulty_buttons = [self.difficulty_button_10, self.difficulty_button_20, self.difficulty_button_50]
+        # The long text buttons continue the row to the right of the 10 word button
+        button_x = SCREEN_WIDTH // 2 + 90
+        for word_count in LONG_TEXT_WORD_COUNTS:
+            button_width = 15 * len(str(word_count)) + 20
+            self.difficulty_buttons.append(TextButton(position=(button_x, SCREEN_HEIGHT * 0.01), width=button_width,
+                                                      height=40, text=str(word_count), font_path=BOLD_FONT_PATH,
+                                                      font_size=30, text_color=(255, 255, 255),
+                                                      background_color=(12, 22, 24, 255),
+                                                      hover_background_color=(150, 150, 150)))
+            button_x += button_width + 10
+        self.text_viewport = TextViewport(visible_lines=LONG_TEXT_VISIBLE_LINES)
+        self.words_regions = (None, [])
         self.input_text = ""
         self.end = False
         self.elapsed_time = 0
@@ -124,12 +216,17 @@ class SlaveType:
         self.words = ""
         self.accuracy = 0
         self.wpm = 0
+        self.net_wpm = 0
+        self.statistics = StatisticsTracker()
+        self.keystrokes = KeystrokeRecorder()
+        self.last_keystrokes = None
         self.running = False
         self.time_running = False
         self.final_time = 0
         self.cursor_visible = True
         self.cursor_timer = 0
         self.cursor_position = 0
+        self.input_widths = PrefixWidths()
         self.base_font_size = FONT_SIZE
         self.reference_resolution = (SCREEN_WIDTH, SCREEN_HEIGHT)
         self.login_button = DifficultyButton(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, SCREEN_HEIGHT // 5.5, 50, 'Login')
@@ -140,23 +237,26 @@ class SlaveType:
         self.visible = True
         self.show_login_screen = True
         self.password = ""
-
-    def get_words(self, word_count):
+        self.render_mode = RENDER_MODE
+        self.dirty_rects = DirtyRectTracker()
+        self.frame_pacer = FramePacer.from_config(FRAME_PACING, FPS)
+        # Stages that run several times per frame are timed where they are called, a disabled profiler
+        # returns the methods unchanged
+        self.render_text = self.frame_profiler.wrap("render_text", self.render_text)
+        self.render_highlighted_line = self.frame_profiler.wrap("render_highlighted_line",
+                                                                self.render_highlighted_line)
+        self.show_leaderboard = self.frame_profiler.wrap("show_leaderboard", self.show_leaderboard)
+        self.dynamic_run_events = self.frame_profiler.wrap("dynamic_run_events", self.dynamic_run_events)
+        self.preload_assets()
+        startup_timer.mark("assets")
+
+    def preload_assets(self):
         """
-        Get a random sentence from the database based on the specified word count.
-
-        Parameters:
-            word_count (int): The number of words in the random sentence to retrieve
-
-        Returns:
-            str: A random sentence from the database
+        Load the fonts of the first frame up front, so drawing the first frame does not stall on font files.
         """
-        try:
-            random_sentence = self.db.get_random_sentence_by_word_count(word_count)
-            return random_sentence
-        except FileNotFoundError:
-            print("Error: File 'text.txt' not found.")
-            sys.exit()
+        font_size = self.get_scaled_font_size()
+        for size in (font_size, font_size // 2, font_size - 5):
+            get_font(MEDIUM_FONT_PATH, size)
 
     def get_scaled_font_size(self):
         """
@@ -182,7 +282,7 @@ class SlaveType:
         return int(current_width * x_percent), int(current_height * y_percent)
 
     def render_text(self, text, position, font_size, text_color, underline=False, cursor_visible=False,
-                    input_text=False):
+                    input_text=False, input_start=None):
         """
         Render the given text on the screen at the specified position with the specified font size and color.
 
@@ -194,36 +294,26 @@ class SlaveType:
         - underline: (Optional) Whether to underline the text
         - cursor_visible: (Optional) Whether the cursor is visible for input text
         - input_text: (Optional) Whether the text is input text
+        - input_start: (Optional) Where the text starts in self.input_text when only the line being typed is
+          shown, as in the long text mode.
 
         Returns:
         None
         """
-        font = pygame.font.Font("../assets/fonts/Roboto-Medium.ttf", font_size)
+        font_path = MEDIUM_FONT_PATH
+        font = get_font(font_path, font_size)
         line_height = font.get_linesize()
 
-        # Common logic for splitting text into lines
-        words = text.split()
-        lines = []
-        current_line = []
-        font_size = self.get_scaled_font_size()  # or use a smaller size if needed
-        for word in words:
-            max_line_width = self.screen.get_width() - 200
-            if get_text_width(' '.join(current_line + [word]), font_size) < max_line_width:
-                current_line.append(word)
-            else:
-                # If the line is full, append it to the lines list and start a new line
-                lines.append(' '.join(current_line))
-                current_line = [word]
-
-        # Add the last line to the lines list
-        lines.append(' '.join(current_line))
+        # Split the text into lines, the layout is cached so unchanged text is not measured again
+        max_line_width = self.screen.get_width() - 200
+        lines = text_layout.wrap(text, font_path, font_size, max_line_width)
 
         # Rendering logic
         x_pos, y_pos = position
         y_pos_offset = 0
 
         for i, line in enumerate(lines):
-            text_surface = font.render(line, True, text_color)
+            text_surface = surface_cache.render(font, line, True, text_color)
             text_rect = text_surface.get_rect(center=(x_pos, y_pos + y_pos_offset))
             self.screen.blit(text_surface, text_rect)
 
@@ -237,11 +327,12 @@ class SlaveType:
                 # Get the current time in milliseconds
                 time_ms = pygame.time.get_ticks()
                 if (time_ms // 500) % 2 == 0:
-                    cursor_x_offset = 0
-                    # Render each character up to the cursor position to get the exact cursor position
-                    for char in self.input_text[:self.cursor_position]:
-                        char_width, _ = font.size(char)
-                        cursor_x_offset += char_width
+                    # The cursor is placed from the prefix widths of the input, which only measure the
+                    # characters typed since the last edit
+                    self.input_widths.update(text)
+                    line_start = max(text.rfind(line), 0) if i else 0
+                    cursor_x_offset = (self.input_widths.width(self.cursor_position - (input_start or 0), font)
+                                       - self.input_widths.width(line_start, font))
 
                     # Calculate the cursor's x position
                     cursor_x = text_rect.left + cursor_x_offset
@@ -251,33 +342,79 @@ class SlaveType:
                     cursor_rect = pygame.Rect(cursor_x, cursor_y, cursor_width, cursor_height)
                     pygame.draw.rect(self.screen, (255, 255, 255), cursor_rect)
 
-                    if get_text_width(line, font_size) > 720:
-                        # Split the line by spaces to get words
-                        words = line.split(' ')
-                        while words and get_text_width(' '.join(words), font_size) > SCREEN_WIDTH - 200:
-                            words.pop()
-                        # Join the words back into a line
-                        line = ' '.join(words)
-                        # Update the self.input_text with the new line without the last word
-                        self.input_text = self.input_text[:self.input_text.rfind(line)]
             # Draw the underline if this is not the input text
             if not input_text and underline and i == len(lines) - 1:
                 pygame.draw.line(self.screen, (255, 255, 255), (text_rect.left, text_rect.bottom),
                                  (text_rect.right, text_rect.bottom), 2)
 
+    def render_highlighted_line(self, line, typed_line, position, font_size, underline=False):
+        """
+        Render a line of the target text with a color per character: typed characters are colored by whether
+        they match, the rest is still to be typed. The line is composed from the glyph atlas, so the colors can
+        change with every keystroke without rendering any text, and a line that did not change is a single
+        opaque blit.
+
+        Parameters:
+            line (str): The line of the target text
+            typed_line (str): The input typed for the line
+            position (tuple): The (x, y) position the line is centered on
+            font_size (int): The size of the font used for rendering
+            underline (bool, optional): Whether to underline the line
+
+        Returns:
+            None
+        """
+        font = get_font(MEDIUM_FONT_PATH, font_size)
+        colors = [CORRECT_TEXT_COLOR if typed_char == char else INCORRECT_TEXT_COLOR
+                  for char, typed_char in zip(line, typed_line)]
+        colors += [PENDING_TEXT_COLOR] * (len(line) - len(colors))
+
+        line_surface = glyph_atlas.compose(font, line, colors, BACKGROUND_COLOR[:3])
+        line_rect = self.screen.blit(line_surface, line_surface.get_rect(center=position))
+
+        # A mistyped space has no glyph, it is marked below the line instead
+        offsets = glyph_atlas.get_offsets(font, line)
+        index = line.find(" ", 0, len(typed_line))
+        while index != -1:
+            if typed_line[index] != " ":
+                pygame.draw.rect(self.screen, INCORRECT_TEXT_COLOR,
+                                 (line_rect.left + offsets[index], line_rect.bottom - 4,
+                                  offsets[index + 1] - offsets[index], 3))
+            index = line.find(" ", index + 1, len(typed_line))
+        if underline:
+            pygame.draw.line(self.screen, (255, 255, 255), (line_rect.left, line_rect.bottom),
+                             (line_rect.right, line_rect.bottom), 2)
+
     def calculate_statistics(self):
         """
-        Calculate the number of correct characters typed, update accuracy, and update WPM.
+        Update accuracy, raw WPM and net WPM from the statistics tracker, which keeps the number of correct
+        characters up to date on every keystroke.
         """
-        # Calculate the number of correct characters typed
-        correct_chars = sum(1 for char_input, char_word in zip(self.input_text, self.words) if char_input == char_word)
-        total_chars = len(self.words)
+        if DEBUG_STATISTICS and not self.statistics.verify(self.input_text):
+            print("Statistics tracker out of sync with the input text, recounting.")
+            self.statistics.recount(self.input_text)
 
         # Update accuracy
-        self.accuracy = (correct_chars / total_chars) * 100 if total_chars > 0 else 0
+        self.accuracy = self.statistics.accuracy()
 
         # Update WPM (Words Per Minute)
-        self.wpm = (len(self.input_text) / 5) / (self.elapsed_time / 60) if self.elapsed_time > 0 else 0
+        self.wpm = self.statistics.raw_wpm(self.elapsed_time)
+        self.net_wpm = self.statistics.net_wpm(self.elapsed_time)
+
+    def update_elapsed_time(self):
+        """
+        Update the elapsed time while the timer is running.
+        """
+        if not self.end and self.start_time and self.time_running:
+            self.elapsed_time = round(time.time() - self.start_time, 2)
+
+    def get_time_text(self):
+        """
+        Return the text shown by the on-screen timer.
+        """
+        if self.end:
+            return "Time: {:.2f} seconds".format(self.final_time)
+        return "Time: {:.2f} seconds".format(self.elapsed_time)
 
     def display_time(self):
         """
@@ -287,14 +424,12 @@ class SlaveType:
         time_rect = pygame.Rect(0, current_height * 0.7, current_width, current_height * 0.1)
         self.screen.fill((12, 22, 24, 255), time_rect)
 
-        if self.end:
-            time_text = "Time: {:.2f} seconds".format(self.final_time)
-        else:
-            if self.start_time and self.time_running:
-                self.elapsed_time = round(time.time() - self.start_time, 2)
-            time_text = "Time: {:.2f} seconds".format(self.elapsed_time)
+        self.update_elapsed_time()
+        time_text = self.get_time_text()
 
         for y_pos, template in STATISTICS_POSITIONS:
+            if not template.startswith("Time"):
+                continue
             font_size = self.get_scaled_font_size() // 2
             # Calculate the centered x position dynamically
             x_pos = current_width // 2
@@ -334,17 +469,68 @@ class SlaveType:
         """
         self.end = False
         self.input_text = ""
+        self.cursor_position = 0
         self.words = ""
         self.start_time = 0
         self.elapsed_time = 0
         self.wpm = 0
+        self.net_wpm = 0
         self.accuracy = 0  # Reset accuracy
         self.final_time = 0  # Reset the final time
 
-        while not self.words:
-            self.words = self.get_words(words)
-        else:
-            self.words = self.words
+        self.statistics.reset(self.words)
+        self.keystrokes = KeystrokeRecorder()
+
+        # Sentences are prefetched in the background, if none is ready yet poll_db_futures picks one up later
+        self.requested_word_count = words
+        self.use_prefetched_sentence()
+
+    def use_prefetched_sentence(self):
+        """
+        Take a prefetched sentence for the requested word count and start the test with it. Runs of whitespace
+        are collapsed to single spaces, as the target text is wrapped and colored per character with single
+        spaces between the words.
+
+        Returns:
+            bool: True if a sentence was ready.
+        """
+        sentence = self.sentence_prefetcher.take(self.requested_word_count)
+        if not sentence:
+            return False
+        self.words = " ".join(sentence.split())
+        self.statistics.reset(self.words)
+        self.statistics.recount(self.input_text)
+        return True
+
+    def poll_db_futures(self):
+        """
+        Check the pending database calls and apply the results of the finished ones. Called once per frame,
+        so the frame time never depends on the database latency.
+        """
+        self.sentence_prefetcher.poll()
+        if not self.words:
+            self.use_prefetched_sentence()
+
+        if self.login_future is not None and self.login_future.done():
+            future, self.login_future = self.login_future, None
+            try:
+                session = future.result()
+            except Exception as error:
+                print("Login failed: {}".format(error))
+                session = None
+            self.finish_login(session)
+
+        if self.signup_future is not None and self.signup_future.done():
+            future, self.signup_future = self.signup_future, None
+            try:
+                created = future.result()
+            except Exception as error:
+                print("Signup failed: {}".format(error))
+                created = False
+            self.finish_signup(created)
+
+        self.leaderboard_cache.poll()
+        self.statistics_writer.poll()
 
     def handle_events(self):
         """
@@ -355,12 +541,16 @@ class SlaveType:
             self.login_button.update(mouse_pos)
             self.signup_button.update(mouse_pos)
         for event in pygame.event.get():
+            self.frame_pacer.notify_activity()
             self.leaderboard_button.handle_event(event)
             self.back_button.handle_event(event)
             self.handle_difficulty_event(event)
 
-            if event.type == pygame.QUIT:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.frame_profiler.enabled:
+                self.frame_profiler.toggle_overlay()
+            elif event.type == pygame.QUIT:
                 self.running = False
+                self.shutdown()
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
@@ -403,15 +593,23 @@ class SlaveType:
         Returns:
             None
         """
+        if not self.words:
+            # The sentence is still loading, the test cannot start yet
+            return
         if not self.end:
             if not self.time_running:  # Start the timer when the first key is pressed
                 self.start_time = time.time()
                 self.time_running = True
 
+            position = len(self.input_text)
+            expected_char = self.words[position] if position < len(self.words) else ""
+            self.keystrokes.record(event.key, expected_char, bool(event.unicode) and event.unicode == expected_char)
+
             if event.key == pygame.K_RETURN:
                 self.restart_button.visible = True
                 self.final_time = self.elapsed_time
                 self.save_user_statistics()
+                self.save_keystrokes()
                 self.time_running = False
                 self.end = True
                 self.game_id += 1
@@ -479,6 +677,7 @@ class SlaveType:
             button.rect.center = button.position
             count += 100
         # Redraw the entire screen with the updated positions
+        self.dirty_rects.invalidate()
         self.screen.fill((12, 22, 24, 255))
         self.dynamic_run_events()
         pygame.display.update()
@@ -488,11 +687,15 @@ class SlaveType:
         Remove the character at the cursor position in the input text.
         """
         if self.cursor_position > 0:
+            removed_char = self.input_text[self.cursor_position - 1]
             self.input_text = (
                     self.input_text[: self.cursor_position - 1]
                     + self.input_text[self.cursor_position:]
             )
             self.cursor_position -= 1
+            input_start, visible_input = self.get_visible_input()
+            self.input_widths.delete(visible_input, self.cursor_position - input_start)
+            self.statistics.remove_character(self.cursor_position, removed_char, self.input_text)
 
     def add_character_at_cursor(self, char):
         """
@@ -504,11 +707,17 @@ class SlaveType:
         Returns:
         None
         """
+        if not char:
+            # Modifier keys such as shift produce no character
+            return
         if char == ' ':
             self.input_text += ' '
         else:
             self.input_text += char
         self.cursor_position += 1
+        input_start, visible_input = self.get_visible_input()
+        self.input_widths.insert(visible_input, len(self.input_text) - 1 - input_start)
+        self.statistics.add_character(len(self.input_text) - 1, char, self.input_text)
 
     def handle_login_events(self):
         """
@@ -527,19 +736,28 @@ class SlaveType:
 
     def user_login(self, username, password):
         """
-        Function for user login with username and password parameters.
+        Function for user login with username and password parameters. The credentials are checked in the
+        background and finish_login is called with the result.
         """
-        massage = ""
-        if self.db.verify_user_credentials(username, password):
-            massage = "Login successful!"
+        if self.login_future is None:
+            self.login_future = self.db_worker.submit(Session.authenticate, self.db, username, password)
+            self.login_toast = self.toasts.show("Logging in...", sticky=True)
+
+    def finish_login(self, session):
+        """
+        Complete the login once the credentials were checked.
+
+        Parameters:
+            session (Session or None): The session of the user if the credentials are valid, None otherwise.
+        """
+        self.toasts.dismiss(self.login_toast)
+        self.login_toast = None
+        if session:
+            self.toasts.show("Login successful!")
+            self.session = session
             self.show_login_screen = False
         else:
-            massage = "Login failed! Incorrect username or password."
-
-        message_position = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150)
-        self.render_text(massage, message_position, self.get_scaled_font_size(), (255, 255, 255))
-        pygame.display.update()
-        pygame.time.delay(2000)
+            self.toasts.show("Login failed! Incorrect username or password.")
 
     def handle_login_keydown_event(self, event):
         """
@@ -606,56 +824,306 @@ class SlaveType:
         This function handles the dynamic running of events. It sets the input text rectangle, renders text,
          sets the position of words, draws buttons, displays time, calculates statistics, and displays statistics.
         """
+        for name, rect, state, draw in self.get_game_regions():
+            draw()
+
+    def get_text_block_rect(self, text, position, font_size):
+        """
+        Calculate the area covered by text rendered with render_text, including the underline and cursor.
+
+        Parameters:
+            text (str): The text to be rendered
+            position (tuple): The (x, y) position the text is centered on
+            font_size (int): The size of the font used for rendering
+
+        Returns:
+            pygame.Rect: The area covered by the text, spanning the whole screen width
+        """
+        font = get_font(MEDIUM_FONT_PATH, font_size)
+        lines = text_layout.wrap(text, MEDIUM_FONT_PATH, font_size, self.screen.get_width() - 200)
+        top = position[1] - font.get_height() // 2 - 1
+        bottom = position[1] + (len(lines) - 1) * font.get_linesize() + font.get_height() // 2 + 3
+        return pygame.Rect(0, top, self.screen.get_width(), bottom - top)
+
+    def draw_input_text(self):
+        """
+        Clear the input text area and render the typed text with the cursor.
+        """
         width, height = self.screen.get_size()
         input_text_rect = pygame.Rect(50, height * 0.35, width - 100, height * 0.1)
-        pygame.draw.rect(self.screen, (12, 22, 24, 255), input_text_rect)
+        pygame.draw.rect(self.screen, BACKGROUND_COLOR, input_text_rect)
+
+        input_start, visible_input = self.get_visible_input()
+        self.render_text(visible_input, self.get_relative_pos(0.5, 0.4), self.get_scaled_font_size(), (0, 255, 0),
+                         input_text=True, cursor_visible=True,
+                         input_start=input_start)
+
+    def is_long_text(self):
+        """
+        Whether the loaded text is shown through the text viewport, a few lines at a time.
+        """
+        return bool(self.words) and self.requested_word_count in LONG_TEXT_WORD_COUNTS
 
-        self.render_text(self.input_text, self.get_relative_pos(0.5, 0.4), self.get_scaled_font_size(), (0, 255, 0),
-                         input_text=True, cursor_visible=True)
+    def get_text_viewport(self):
+        """
+        Return the text viewport with the loaded text laid out for the current font size and screen width.
+        """
+        self.text_viewport.layout(self.words, MEDIUM_FONT_PATH, self.get_scaled_font_size(),
+                                  self.screen.get_width() - 200)
+        return self.text_viewport
 
+    def get_visible_input(self):
+        """
+        Return the part of the input text on screen. In the long text mode only the input of the line being typed
+        is shown.
+
+        Returns:
+            tuple: The position where the visible input starts in self.input_text, and the visible input.
+        """
+        if not self.is_long_text():
+            return 0, self.input_text
+        viewport = self.get_text_viewport()
+        input_start = viewport.line_start(viewport.line_at(len(self.input_text)))
+        return input_start, self.input_text[input_start:]
+
+    def draw_words(self):
+        """
+        Render the target text the user has to type, with the typed characters colored by whether they match.
+        """
         words_position = self.get_relative_pos(0.5, 0.14)
-        self.render_text(self.words, words_position, self.get_scaled_font_size(), (0, 153, 51), underline=True)
-        self.difficulty_button_10.draw(self.screen)
-        self.difficulty_button_20.draw(self.screen)
-        self.difficulty_button_50.draw(self.screen)
-        self.leaderboard_button.draw(self.screen)
-        self.display_time()
+        if not self.words:
+            self.render_text("Loading...", words_position, self.get_scaled_font_size(), PENDING_TEXT_COLOR,
+                             underline=True)
+            return
+        font_size = self.get_scaled_font_size()
+        line_height = get_font(MEDIUM_FONT_PATH, font_size).get_linesize()
+        lines = self.get_highlighted_lines(font_size)
+        for i, (line, typed_line) in enumerate(lines):
+            self.render_highlighted_line(line, typed_line, (words_position[0], words_position[1] + i * line_height),
+                                         font_size, underline=i == len(lines) - 1)
+
+    def get_highlighted_lines(self, font_size):
+        """
+        Wrap the visible target text like render_text wraps it and pair every line with the input typed for it.
+        The words of the target text are separated by single spaces, see use_prefetched_sentence.
+
+        Returns:
+            list: Tuples of (line, typed_line).
+        """
+        typed_text = self.get_visible_input()[1]
+        if self.is_long_text():
+            lines = self.get_text_viewport().get_visible_lines(len(self.input_text))
+        else:
+            lines = text_layout.wrap(self.words, MEDIUM_FONT_PATH, font_size, self.screen.get_width() - 200)
+        highlighted_lines = []
+        line_start = 0
+        for line in lines:
+            highlighted_lines.append((line, typed_text[line_start:line_start + len(line)]))
+            line_start += len(line) + 1
+        return highlighted_lines
+
+    def get_words_regions(self, font_size):
+        """
+        Describe the target text as one region per line, so a keystroke only redraws the line being typed.
+        The regions are kept until the text, the input or the screen changes.
+
+        Returns:
+            list: The (name, rect, state, draw) regions of the target text.
+        """
+        key = (self.words, self.input_text, font_size, self.screen.get_size())
+        if key != self.words_regions[0]:
+            self.words_regions = (key, self.build_words_regions(font_size))
+        return self.words_regions[1]
+
+    def build_words_regions(self, font_size):
+        """
+        Build the regions of the target text, see get_words_regions.
+        """
+        words_position = self.get_relative_pos(0.5, 0.14)
+        if not self.words:
+            words_rect = self.get_text_block_rect("Loading...", words_position, font_size)
+            return [("words", words_rect, font_size, self.draw_words)]
+
+        width = self.screen.get_width()
+        font = get_font(MEDIUM_FONT_PATH, font_size)
+        line_height = font.get_linesize()
+        top = words_position[1] - font.get_height() // 2
+        lines = self.get_highlighted_lines(font_size)
+        regions = []
+        for i, (line, typed_line) in enumerate(lines):
+            underline = i == len(lines) - 1
+            # The strips of the lines do not overlap, the first and the last include the margins of the text block
+            line_top = top + i * line_height - (1 if i == 0 else 0)
+            line_bottom = top + (i + 1) * line_height + (3 if underline else 0)
+            line_rect = pygame.Rect(0, line_top, width, line_bottom - line_top)
+            position = (words_position[0], words_position[1] + i * line_height)
+            regions.append(("words {}".format(i), line_rect, (line, typed_line, font_size, underline),
+                            lambda line=line, typed_line=typed_line, position=position, underline=underline:
+                            self.render_highlighted_line(line, typed_line, position, font_size, underline)))
+        return regions
+
+    def get_game_regions(self):
+        """
+        Describe the typing screen as regions for the dirty rectangle renderer.
+
+        Every region is a (name, rect, state, draw) tuple in drawing order. The state captures everything the
+        region's appearance depends on, so the region only has to be redrawn when its state changes.
+
+        Returns:
+            list: The regions of the typing screen.
+        """
+        width, height = self.screen.get_size()
+        font_size = self.get_scaled_font_size()
+        self.update_elapsed_time()
         self.calculate_statistics()
-        self.display_statistics()
+
+        input_position = self.get_relative_pos(0.5, 0.4)
+        input_rect = pygame.Rect(50, height * 0.35, width - 100, height * 0.1)
+        visible_input = self.get_visible_input()[1]
+        input_rect.union_ip(self.get_text_block_rect(visible_input, input_position, font_size))
+        cursor_phase = (pygame.time.get_ticks() // 500) % 2
+
+        regions = [
+            ("input", input_rect, (visible_input, self.cursor_position, cursor_phase, font_size),
+             self.draw_input_text),
+        ] + self.get_words_regions(font_size)
+        for button in self.difficulty_buttons + [self.leaderboard_button]:
+            regions.append(("button " + button.text, button.rect.copy(), (button.text, button.hover),
+                            lambda button=button: button.draw(self.screen)))
+        regions.append(("time", pygame.Rect(0, height * 0.7, width, height * 0.1), self.get_time_text(),
+                        self.display_time))
+        regions.append(("statistics", pygame.Rect(0, height * 0.8, width, height - height * 0.8),
+                        (f"{self.wpm: .2f}", f"{self.accuracy: .2f}"), self.display_statistics))
+        return regions
+
+    def get_frame_regions(self):
+        """
+        Describe the whole frame as regions for the dirty rectangle renderer, including the login screen and
+        the leaderboard which cover the typing screen, and the toasts on top of everything.
+
+        Returns:
+            list: The regions of the current frame in drawing order.
+        """
+        screen_rect = self.screen.get_rect()
+        if self.leaderboard_button.clicked:
+            best_wpm = self.session.best_wpm if self.session else None
+            leaderboard_state = (self.leaderboard_cache.get(), best_wpm, self.back_button.hover)
+            regions = [("leaderboard", screen_rect, leaderboard_state, self.show_leaderboard)]
+        elif self.show_login_screen:
+            login_state = (self.username_input, len(self.password), self.login_button.hover, self.signup_button.hover)
+            regions = [("login", screen_rect, login_state, self.draw_login_screen)]
+        else:
+            regions = self.get_game_regions()
+            if self.restart_button.visible:
+                regions.append(("restart", self.restart_button.rect.copy(), True,
+                                lambda: self.restart_button.draw(self.screen)))
+        if self.toasts.toasts:
+            toast_center = (self.screen.get_width() // 2, self.screen.get_height() // 2 + 150)
+            regions.append(("toasts", self.toasts.get_rect(toast_center), self.toasts.get_state(),
+                            lambda: self.toasts.draw(self.screen, toast_center)))
+        if self.frame_profiler.overlay_visible:
+            regions.append(("profiler", self.frame_profiler.get_overlay_rect(),
+                            self.frame_profiler.get_overlay_lines(),
+                            lambda: self.frame_profiler.draw_overlay(self.screen)))
+        return regions
+
+    def render_frame(self):
+        """
+        Draw the current frame. In the "full" render mode the whole screen is cleared and redrawn, in the
+        "dirty" render mode only the regions whose state changed are redrawn and passed to pygame.display.update.
+        """
+        regions = self.get_frame_regions()
+        if self.render_mode == "dirty":
+            regions, dirty_rects = self.dirty_rects.collect(regions)
+            for rect in dirty_rects:
+                self.screen.fill(BACKGROUND_COLOR, rect)
+            for name, rect, state, draw in regions:
+                draw()
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+        else:
+            self.screen.fill(BACKGROUND_COLOR)
+            for name, rect, state, draw in regions:
+                draw()
+            pygame.display.update()
 
     def user_signup(self, username_input, password):
         """
         This function handles user signup by inserting the username and password into the database.
-        It takes the username_input and password as parameters and does not return anything.
+        It takes the username_input and password as parameters and does not return anything. The user is
+        inserted in the background and finish_signup is called with the result.
         """
-        massage = ""
-        if self.db.insert_user(username_input, password):
-            massage = "Signup successful!"
-        else:
-            massage = "Signup failed! Username already exists."
+        if self.signup_future is None:
+            self.signup_future = self.db_worker.submit(self.db.insert_user, username_input, password)
+            self.signup_toast = self.toasts.show("Signing up...", sticky=True)
 
-        message_position = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150)
-        self.render_text(massage, message_position, self.get_scaled_font_size(), (255, 255, 255))
-        pygame.display.update()
-        pygame.time.delay(2000)
+    def finish_signup(self, created):
+        """
+        Complete the signup once the user was inserted.
+
+        Parameters:
+            created (bool): Whether the user was created.
+        """
+        self.toasts.dismiss(self.signup_toast)
+        self.signup_toast = None
+        if created:
+            self.toasts.show("Signup successful!")
+        else:
+            self.toasts.show("Signup failed! Username already exists.")
 
     def save_user_statistics(self):
         """
-        Save user statistics to the database.
+        Queue the user statistics for the write-behind writer, which saves them to the database in batches.
+        The user ID comes from the session, so no lookup by username is needed.
+        """
+        if self.session is None:
+            self.statistics_writer.add(self.username_input, self.game_id, self.wpm, self.accuracy,
+                                       self.elapsed_time)
+            return
+        self.session.record_result(self.wpm)
+        self.statistics_writer.add(self.session.username, self.game_id, self.wpm, self.accuracy, self.elapsed_time,
+                                   user_id=self.session.user_id)
+
+    def shutdown(self):
+        """
+        Save the waiting statistics, spooling them if the database is unreachable, stop the database worker and
+        write the profiler data if FRAME_PROFILER has a DUMP_PATH.
         """
-        self.db.insert_user_statistics(self.db.get_user_id_by_username(self.username_input), self.game_id,
-                                       self.wpm, self.accuracy, self.elapsed_time)
+        self.statistics_writer.close()
+        self.db_worker.shutdown(wait=False)
+        self.frame_profiler.dump()
+
+    def fetch_leaderboard(self):
+        """
+        Fetch the best daily scores and the best scores of all time. Runs on the database worker.
+
+        Returns:
+            tuple: The daily scores and the all-time scores.
+        """
+        return self.db.get_top_daily_scores(limit=5), self.db.get_top_scores(limit=5)
+
+    def save_keystrokes(self):
+        """
+        Keep the keystrokes of the finished session and write them to KEYSTROKE_LOG_DIR if it is configured.
+        """
+        self.last_keystrokes = self.keystrokes
+        if KEYSTROKE_LOG_DIR:
+            os.makedirs(KEYSTROKE_LOG_DIR, exist_ok=True)
+            file_name = "session-{}-{}.keys".format(int(time.time()), self.game_id)
+            self.keystrokes.save(os.path.join(KEYSTROKE_LOG_DIR, file_name))
 
     def show_leaderboard(self):
         """
         Function to display the leaderboard on the screen, including best daily scores and best scores of all time.
-        This function fetches the top daily scores and all-time scores from the database and renders them on the screen.
+        The scores come from the leaderboard cache, which refreshes them in the background once they are older
+        than LEADERBOARD_TTL. A placeholder is shown until the first scores arrive. The rows of the logged in
+        user are highlighted and their personal best is shown from the session.
         """
         self.screen.fill((12, 22, 24, 255))  # Clean the screen
         screen_width, screen_height = self.screen.get_size()
 
-        daily_scores = self.db.get_top_daily_scores(limit=5)
-        all_time_scores = self.db.get_top_scores(limit=5)
+        scores = self.leaderboard_cache.get()
+        daily_scores, all_time_scores = scores if scores is not None else ([], [])
 
         font_size = self.get_scaled_font_size() - 5
         start_y = screen_height * 0.1  # Starting y position to draw the leaderboard
@@ -676,13 +1144,18 @@ class SlaveType:
         # Define a padding value to control the space between lines
         padding = screen_height * 0.05
 
+        if scores is None:
+            self.render_text("Loading...", (screen_width // 2, start_y + (font_size + padding) * 3), font_size,
+                             (255, 255, 255))
+
         # Render the daily scores
         for i, score in enumerate(daily_scores):
             rank = i + 1
             username, wpm, accuracy, date_played = score
             score_text = f"{rank}  {username}  {wpm: .2f}  {accuracy: .2f}%"
             line_height = font_size + padding  # Calculate the total height for each line including padding
-            self.render_text(score_text, (column_spacing, start_y + line_height * (3 + i)), font_size, (255, 255, 255))
+            self.render_text(score_text, (column_spacing, start_y + line_height * (3 + i)), font_size,
+                             self.get_score_color(username))
 
         # Render the all-time best scores
         for i, score in enumerate(all_time_scores):
@@ -691,36 +1164,58 @@ class SlaveType:
             score_text = f"{rank}  {username}  {wpm: .2f}  {accuracy: .2f}%"
             line_height = font_size + padding  # Calculate the total height for each line including padding
             self.render_text(score_text, (screen_width - column_spacing, start_y + line_height * (3 + i)), font_size,
-                             (255, 255, 255))
+                             self.get_score_color(username))
+
+        if self.session is not None and self.session.best_wpm is not None:
+            best_text = f"Your best: {self.session.best_wpm: .2f} WPM"
+            self.render_text(best_text, (screen_width // 2, start_y + (font_size + padding) * 9), font_size,
+                             HIGHLIGHT_COLOR)
 
         self.back_button.rect.center = (screen_width // 2, screen_height - self.back_button.rect.height // 2)
         self.back_button.draw(self.screen)
-        pygame.display.update()
+
+    def get_score_color(self, username):
+        """
+        Return the color of a leaderboard row, highlighting the rows of the logged in user.
+        """
+        if self.session is not None and self.session.is_current_user(username):
+            return HIGHLIGHT_COLOR
+        return (255, 255, 255)
+
+    def run_frame(self):
+        """
+        Run one iteration of the main loop: handle the events, apply finished database calls and draw the
+        frame. Waiting for the next frame is left to the caller.
+        """
+        profiler = self.frame_profiler
+        profiler.begin_frame()
+        profiler.stage("handle_events", self.handle_events)
+        profiler.stage("poll_db_futures", self.poll_db_futures)
+        if self.back_button.clicked:
+            self.leaderboard_button.clicked = False
+        self.toasts.update()
+        profiler.stage("render_frame", self.render_frame)
+        profiler.end_frame()
 
     def run(self):
         """
         The run function restarts, sets the running flag to True, and then runs a game loop until the running flag
-        is set to False. It handles events, updates the screen, and manages the clock to control the frame rate.
+        is set to False. It handles events, updates the screen, and lets the frame pacer control the frame rate.
         Finally, it quits pygame and exits the program.
         """
         self.restart()
         self.running = True
-        clock = pygame.time.Clock()
 
         while self.running:
-            self.screen.fill((12, 22, 24, 255))
-            self.handle_events()
-            self.dynamic_run_events()
-            if not self.show_login_screen and self.restart_button.visible:
-                self.restart_button.draw(self.screen)
-            if self.show_login_screen:
-                self.draw_login_screen()
-            if self.leaderboard_button.clicked:
-                self.show_leaderboard()
-            if self.back_button.clicked:
-                self.leaderboard_button.clicked = False
-            pygame.display.update()
-            clock.tick(FPS)
-
+            self.run_frame()
+            startup_timer.finish(report=REPORT_STARTUP)
+            # Wake up in time for the next cursor blink or toast expiry even if no event arrives
+            wake_in_ms = 500 - pygame.time.get_ticks() % 500
+            toast_change_ms = self.toasts.ms_until_change()
+            if toast_change_ms is not None:
+                wake_in_ms = min(wake_in_ms, toast_change_ms)
+            self.frame_pacer.tick(timer_running=self.time_running, wake_in_ms=wake_in_ms)
+
+        self.shutdown()
         pygame.quit()
         sys.exit()
@@ -0,0 +1,217 @@
+import datetime
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from src.DB import DatabaseBackend
+
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATE", lambda value: datetime.date.fromisoformat(value.decode()))
+sqlite3.register_converter("DATETIME", lambda value: datetime.datetime.fromisoformat(value.decode()))
+
+
+class SQLiteCursor:
+    def __init__(self, cursor):
+        """
+        Wrap an sqlite3 cursor so the queries shared with MySQL, written with "%s" placeholders, run unchanged.
+
+        Parameters:
+            cursor (sqlite3.Cursor): The wrapped cursor.
+        """
+        self.cursor = cursor
+
+    def execute(self, query, params=()):
+        return self.cursor.execute(query.replace("%s", "?"), params)
+
+    def executemany(self, query, rows):
+        return self.cursor.executemany(query.replace("%s", "?"), rows)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+
+class SQLiteDatabase(DatabaseBackend):
+    def __init__(self, path="../data/slavetype.db"):
+        """
+        Initializes an embedded SQLite database, created with the full schema on first use.
+
+        The database runs in WAL mode, so the game can read while a background write is committed. Every thread
+        gets its own connection; an in-memory database (":memory:") is a single connection shared under a lock.
+
+        :param path: The path of the database file, or ":memory:".
+        """
+        super().__init__()
+        self.path = path
+        self.in_memory = path == ":memory:"
+        self.pool_size = 1 if self.in_memory else 2
+        self.local = threading.local()
+        self.connections = []
+        self.connections_lock = threading.Lock()
+        self.memory_lock = threading.Lock()
+
+    def connect(self):
+        """
+        Open a new connection and configure it for the game.
+        """
+        if not self.in_memory:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES,
+                                     check_same_thread=not self.in_memory)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        with self.connections_lock:
+            self.connections.append(connection)
+        return connection
+
+    def get_connection(self):
+        """
+        Return the connection of the calling thread, opening it on first use.
+        """
+        if self.in_memory:
+            with self.connections_lock:
+                if self.connections:
+                    return self.connections[0]
+            return self.connect()
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = self.local.connection = self.connect()
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """
+        Provide the connection of the calling thread for the duration of a call.
+
+        The schema is created once before the first call. A failed call is rolled back.
+
+        Yields:
+            tuple: The connection and a cursor accepting "%s" placeholders.
+        """
+        self.check_schema()
+        connection = self.get_connection()
+        lock = self.memory_lock if self.in_memory else None
+        if lock:
+            lock.acquire()
+        try:
+            yield connection, SQLiteCursor(connection.cursor())
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            if lock:
+                lock.release()
+
+    def ensure_schema(self):
+        """
+        Create the tables and indexes used by the game if they do not exist yet, and fill the best score tables
+        from UserStatistics when they are empty.
+        """
+        with self.connection() as (db, cursor):
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL UNIQUE,
+                    password TEXT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sentences (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sentence TEXT NOT NULL,
+                    word_count INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentences_word_count ON sentences (word_count)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS UserStatistics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER REFERENCES users (id),
+                    game_id INTEGER,
+                    wpm REAL NOT NULL,
+                    accuracy REAL NOT NULL,
+                    play_time REAL NOT NULL,
+                    date_played DATETIME NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_statistics_user_date ON UserStatistics (user_id, date_played)
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS UserBestScores (
+                    user_id INTEGER PRIMARY KEY REFERENCES users (id),
+                    wpm REAL NOT NULL,
+                    accuracy REAL NOT NULL,
+                    date_played DATETIME NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_best_wpm ON UserBestScores (wpm)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS UserDailyBestScores (
+                    user_id INTEGER NOT NULL REFERENCES users (id),
+                    day DATE NOT NULL,
+                    wpm REAL NOT NULL,
+                    accuracy REAL NOT NULL,
+                    date_played DATETIME NOT NULL,
+                    PRIMARY KEY (user_id, day)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_best_day_wpm ON UserDailyBestScores (day, wpm)")
+            cursor.execute("SELECT 1 FROM UserBestScores LIMIT 1")
+            has_best_scores = cursor.fetchone() is not None
+            cursor.execute("SELECT 1 FROM UserStatistics LIMIT 1")
+            has_statistics = cursor.fetchone() is not None
+            db.commit()
+        if has_statistics and not has_best_scores:
+            self.rebuild_best_scores()
+
+    def update_best_scores(self, cursor, rows):
+        """
+        Keep the best score tables up to date with new results, in the transaction of the insert, using
+        SQLite's ON CONFLICT upsert.
+
+        Parameters:
+            cursor: The cursor of the running transaction.
+            rows (list): Tuples of (user_id, game_id, wpm, accuracy, play_time, date_played) of known users.
+        """
+        if not rows:
+            return
+        update = """
+            DO UPDATE SET wpm = excluded.wpm, accuracy = excluded.accuracy, date_played = excluded.date_played
+            WHERE excluded.wpm > {table}.wpm
+        """
+        cursor.executemany("""
+            INSERT INTO UserBestScores (user_id, wpm, accuracy, date_played)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (user_id)
+        """ + update.format(table="UserBestScores"),
+            [(user_id, wpm, accuracy, date_played)
+             for user_id, game_id, wpm, accuracy, play_time, date_played in rows])
+        cursor.executemany("""
+            INSERT INTO UserDailyBestScores (user_id, day, wpm, accuracy, date_played)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (user_id, day)
+        """ + update.format(table="UserDailyBestScores"),
+            [(user_id, date_played.date(), wpm, accuracy, date_played)
+             for user_id, game_id, wpm, accuracy, play_time, date_played in rows])
+
+    def close(self):
+        """
+        Closes the database connections.
+        """
+        with self.connections_lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.ProgrammingError:
+                # Connections of other threads can only be closed by their thread
+                pass
+        self.local = threading.local()
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DBWorker:
+    def __init__(self, max_workers=1, profiler=None):
+        """
+        Initialize the worker that runs database calls off the render thread.
+
+        Parameters:
+            max_workers (int, optional): The number of worker threads. A MySQL connection must not be shared
+                between threads, so this should not exceed the size of the database connection pool.
+                Defaults to 1.
+            profiler (FrameProfiler, optional): Times every call when given. Defaults to None.
+        """
+        self.profiler = profiler
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedule a database call and return immediately.
+
+        Args:
+            fn (callable): The function performing the database call.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            concurrent.futures.Future: The future the game polls for the result.
+        """
+        if self.profiler is not None:
+            fn = self.profiler.wrap_call("db " + getattr(fn, "__name__", "call"), fn)
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker. Calls that have not started yet are cancelled.
+
+        Args:
+            wait (bool, optional): Whether to wait for the running call to finish. Defaults to True.
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def report_exception(future):
+    """
+    Done callback for fire-and-forget database calls that prints the error of a failed call.
+
+    Args:
+        future (concurrent.futures.Future): The finished future.
+
+    Returns:
+        None
+    """
+    if not future.cancelled() and future.exception() is not None:
+        print("Database call failed: {}".format(future.exception()))
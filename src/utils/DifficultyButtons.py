@@ -1,5 +1,8 @@
 import pygame
 
+from src.utils.FontRegistry import get_font
+from src.utils.SurfaceCache import surface_cache
+
 
 class DifficultyButton:
     def __init__(self, x, y, width, height, text='', color=(12, 22, 24, 0)):
@@ -11,13 +14,13 @@ class DifficultyButton:
         self.default_color = (100, 100, 100)
         self.hover_color = (150, 150, 150)
         self.font_color = (255, 255, 255)
-        self.font = pygame.font.Font(None, 36)
+        self.font = get_font(None, 36)
 
     def draw(self, screen):
         # Change the button color based on hover state
         color = self.hover_color if self.hover else self.default_color
         pygame.draw.rect(screen, color, self.rect)
-        text_surface = self.font.render(self.text, True, self.font_color)
+        text_surface = surface_cache.render(self.font, self.text, True, self.font_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
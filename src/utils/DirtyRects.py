@@ -0,0 +1,56 @@
+class DirtyRectTracker:
+    def __init__(self):
+        """
+        Initialize the tracker that decides which screen regions have to be redrawn.
+
+        A region is described by a tuple (name, rect, state, draw), where state is any comparable value that
+        captures everything the region's appearance depends on and draw is a callable that paints it.
+        """
+        self.states = {}
+        self.rects = {}
+
+    def invalidate(self):
+        """
+        Forget every known state so the next frame redraws all regions, e.g. after a resize.
+        """
+        self.states.clear()
+        self.rects.clear()
+
+    def collect(self, regions):
+        """
+        Compare the regions with the previous frame and return the ones that have to be redrawn.
+
+        A region is dirty when its state changed or it is new. Regions overlapping a dirty area are redrawn
+        as well, so clearing a dirty area never erases a neighbour, and the area a region occupied in the
+        previous frame is cleared too, so shrinking or removed regions leave nothing behind.
+
+        Args:
+            regions (list): The (name, rect, state, draw) tuples of the current frame in drawing order.
+
+        Returns:
+            tuple: The regions to redraw in drawing order and the list of pygame.Rect areas to clear and update.
+        """
+        dirty = {}
+        for index, (name, rect, state, draw) in enumerate(regions):
+            if name not in self.states or self.states[name] != state:
+                old_rect = self.rects.get(name)
+                dirty[index] = rect.union(old_rect) if old_rect else rect.copy()
+
+        current_names = {region[0] for region in regions}
+        removed_areas = [rect for name, rect in self.rects.items() if name not in current_names]
+
+        # Pull in every region that overlaps an area that is about to be cleared
+        expanded = True
+        while expanded:
+            expanded = False
+            areas = list(dirty.values()) + removed_areas
+            for index, (name, rect, state, draw) in enumerate(regions):
+                if index not in dirty and rect.collidelist(areas) != -1:
+                    dirty[index] = rect.copy()
+                    expanded = True
+
+        self.states = {name: state for name, rect, state, draw in regions}
+        self.rects = {name: rect.copy() for name, rect, state, draw in regions}
+
+        dirty_regions = [region for index, region in enumerate(regions) if index in dirty]
+        return dirty_regions, list(dirty.values()) + removed_areas
@@ -0,0 +1,55 @@
+import pygame
+
+from src.utils.LRUCache import LRUCache
+
+
+class FontRegistry:
+    def __init__(self, max_fonts=32):
+        """
+        Initialize a registry that shares loaded fonts between every part of the game.
+
+        Parameters:
+            max_fonts (int, optional): The number of (path, size) fonts kept loaded in an LRUCache, so sizes
+                that stop being used after a window resize are released. Defaults to 32.
+        """
+        self.fonts = LRUCache(max_fonts)
+
+    def get(self, path, size):
+        """
+        Return the font for the given path and size, loading it from disk only on the first request.
+
+        Args:
+            path (str or None): The path to the font file, or None for the pygame default font.
+            size (int): The size of the font.
+
+        Returns:
+            pygame.font.Font: The shared font object.
+        """
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts.put(key, pygame.font.Font(path, size))
+        return font
+
+    def clear(self):
+        """
+        Release every loaded font.
+        """
+        self.fonts.clear()
+
+
+font_registry = FontRegistry()
+
+
+def get_font(path, size):
+    """
+    Return the shared font for the given path and size from the process-wide registry.
+
+    Args:
+        path (str or None): The path to the font file, or None for the pygame default font.
+        size (int): The size of the font.
+
+    Returns:
+        pygame.font.Font: The shared font object.
+    """
+    return font_registry.get(path, size)
@@ -0,0 +1,83 @@
+import pygame
+
+
+class FramePacer:
+    def __init__(self, mode="adaptive", active_fps=240, timer_fps=30, idle_fps=2, idle_after_ms=1000):
+        """
+        Initialize the frame pacer that decides how long the main loop sleeps between frames.
+
+        Parameters:
+            mode (str, optional): "fixed" always ticks at active_fps, "adaptive" lowers the frame rate when
+                nothing is happening. Defaults to "adaptive".
+            active_fps (int, optional): The frame rate while input events are arriving. Defaults to 240.
+            timer_fps (int, optional): The frame rate while the timer is running but no input arrives.
+                Defaults to 30.
+            idle_fps (int, optional): The minimum frame rate while idle. The loop blocks on the event queue
+                between these frames and wakes up immediately when an event arrives. Defaults to 2.
+            idle_after_ms (int, optional): How long after the last input event the pacer leaves the active
+                frame rate. Defaults to 1000.
+        """
+        self.mode = mode
+        self.active_fps = active_fps
+        self.timer_fps = timer_fps
+        self.idle_fps = idle_fps
+        self.idle_after_ms = idle_after_ms
+        self.clock = pygame.time.Clock()
+        self.last_activity = 0
+
+    @classmethod
+    def from_config(cls, pacing_config, default_fps):
+        """
+        Create a frame pacer from the "FRAME_PACING" section of the configuration.
+
+        Args:
+            pacing_config (dict): The frame pacing settings, missing keys fall back to the defaults.
+            default_fps (int): The frame rate used for ACTIVE_FPS when it is not configured.
+
+        Returns:
+            FramePacer: The configured frame pacer.
+        """
+        return cls(mode=pacing_config.get("MODE", "adaptive"),
+                   active_fps=pacing_config.get("ACTIVE_FPS", default_fps),
+                   timer_fps=pacing_config.get("TIMER_FPS", 30),
+                   idle_fps=pacing_config.get("IDLE_FPS", 2),
+                   idle_after_ms=pacing_config.get("IDLE_AFTER_MS", 1000))
+
+    def notify_activity(self):
+        """
+        Record that an input event arrived, switching the pacer to the active frame rate.
+        """
+        self.last_activity = pygame.time.get_ticks()
+
+    def is_active(self):
+        """
+        Return True if an input event arrived recently.
+        """
+        return pygame.time.get_ticks() - self.last_activity < self.idle_after_ms
+
+    def tick(self, timer_running=False, wake_in_ms=None):
+        """
+        Wait until the next frame is due.
+
+        Args:
+            timer_running (bool, optional): Whether the on-screen timer needs regular updates. Defaults to False.
+            wake_in_ms (int, optional): The time until the screen changes on its own, e.g. the next cursor
+                blink. An idle pacer never sleeps past it. Defaults to None.
+
+        Returns:
+            None
+        """
+        if self.mode == "fixed" or self.is_active():
+            self.clock.tick(self.active_fps)
+        elif timer_running:
+            self.clock.tick(self.timer_fps)
+        else:
+            timeout = 1000 // self.idle_fps
+            if wake_in_ms is not None:
+                timeout = max(1, min(timeout, wake_in_ms))
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                # Put the event back so the main loop handles it as usual
+                pygame.event.post(event)
+                self.notify_activity()
+            self.clock.tick()
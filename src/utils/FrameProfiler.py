@@ -0,0 +1,265 @@
+import functools
+import json
+import math
+import os
+import threading
+import time
+from array import array
+
+import pygame
+
+from src.Config import resolve_path
+from src.utils.FontRegistry import get_font
+
+
+def percentile(values, percent):
+    """
+    Return the nearest-rank percentile of a list of values, 0 for an empty list.
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        """
+        Initialize a fixed-size buffer of the latest integer samples. Once full, every new sample replaces the
+        oldest one, so the memory use never grows.
+
+        Parameters:
+            capacity (int): The number of samples kept.
+        """
+        self.values = array("q", bytes(8 * capacity))
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        """
+        Add a sample, replacing the oldest one when the buffer is full.
+        """
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def samples(self):
+        """
+        Return the kept samples, oldest first.
+        """
+        if self.count < self.capacity:
+            return self.values[:self.count].tolist()
+        return self.values[self.index:].tolist() + self.values[:self.index].tolist()
+
+
+class FrameProfiler:
+    FRAME = "frame"
+
+    def __init__(self, enabled=False, capacity=600, dump_path=None, overlay_interval_ms=250):
+        """
+        Initialize the frame profiler, which times the stages of the main loop with perf_counter_ns.
+
+        Every stage keeps its latest timings in a ring buffer. Stages that run several times per frame, like
+        render_text, are summed per frame; database calls are timed on the worker, one sample per call. When
+        the profiler is disabled nothing is wrapped and each hook returns immediately.
+
+        Parameters:
+            enabled (bool, optional): Whether the stages are timed. Defaults to False.
+            capacity (int, optional): The number of samples kept per stage. Defaults to 600.
+            dump_path (str, optional): Where dump writes the samples as JSON on exit. Defaults to None.
+            overlay_interval_ms (int, optional): How often the overlay text is refreshed. Defaults to 250.
+        """
+        self.enabled = enabled
+        self.capacity = capacity
+        self.dump_path = dump_path
+        self.overlay_interval_ms = overlay_interval_ms
+        self.overlay_visible = False
+        self.overlay_lines = ()
+        self.overlay_updated_at = 0
+        self.buffers = {}
+        self.frame_totals = {}
+        self.frame_started = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, profiler_config):
+        """
+        Create a frame profiler from the "FRAME_PROFILER" section of the configuration.
+
+        Args:
+            profiler_config (dict): The profiler settings, missing keys fall back to the defaults. A relative
+                DUMP_PATH is relative to the src directory, like the other configured paths.
+
+        Returns:
+            FrameProfiler: The configured profiler.
+        """
+        return cls(enabled=profiler_config.get("ENABLED", False),
+                   capacity=profiler_config.get("CAPACITY", 600),
+                   dump_path=resolve_path(profiler_config.get("DUMP_PATH")))
+
+    def record(self, name, duration_ns):
+        """
+        Add a timing to the ring buffer of a stage. Safe to call from the database worker.
+        """
+        with self.lock:
+            buffer = self.buffers.get(name)
+            if buffer is None:
+                buffer = self.buffers[name] = RingBuffer(self.capacity)
+            buffer.append(duration_ns)
+
+    def begin_frame(self):
+        """
+        Start timing a frame.
+        """
+        if self.enabled:
+            self.frame_started = time.perf_counter_ns()
+            self.frame_totals = {}
+
+    def end_frame(self):
+        """
+        Finish timing a frame and store the time of every stage that ran during it.
+        """
+        if not self.enabled:
+            return
+        self.record(self.FRAME, time.perf_counter_ns() - self.frame_started)
+        for name, duration_ns in self.frame_totals.items():
+            self.record(name, duration_ns)
+
+    def stage(self, name, fn, *args, **kwargs):
+        """
+        Call a function and add its duration to the stage's total of the current frame.
+
+        Args:
+            name (str): The name of the stage.
+            fn (callable): The function to call.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The result of the function.
+        """
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        started = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.frame_totals[name] = self.frame_totals.get(name, 0) + time.perf_counter_ns() - started
+
+    def wrap(self, name, fn):
+        """
+        Return fn timed as a frame stage, or fn itself when the profiler is disabled.
+        """
+        if not self.enabled:
+            return fn
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            return self.stage(name, fn, *args, **kwargs)
+        return timed
+
+    def wrap_call(self, name, fn):
+        """
+        Return fn timed once per call, for functions that run outside the frame such as database calls.
+        """
+        if not self.enabled:
+            return fn
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter_ns() - started)
+        return timed
+
+    def summary(self):
+        """
+        Summarize the kept timings of every stage.
+
+        Returns:
+            dict: For every stage the number of samples and the p50, p99 and maximum in milliseconds.
+        """
+        with self.lock:
+            samples = {name: buffer.samples() for name, buffer in self.buffers.items()}
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) / 1e6,
+                "p99_ms": percentile(values, 99) / 1e6,
+                "max_ms": max(values, default=0) / 1e6,
+            }
+            for name, values in samples.items()
+        }
+
+    def toggle_overlay(self):
+        """
+        Show or hide the overlay, only possible while the profiler is enabled.
+        """
+        self.overlay_visible = self.enabled and not self.overlay_visible
+        self.overlay_updated_at = 0
+
+    def get_overlay_lines(self):
+        """
+        Return the overlay text. It is refreshed every overlay_interval_ms, so the overlay stays readable and
+        is not redrawn every frame.
+        """
+        now = pygame.time.get_ticks()
+        if not self.overlay_lines or now - self.overlay_updated_at >= self.overlay_interval_ms:
+            self.overlay_updated_at = now
+            summary = self.summary()
+            frame = summary.pop(self.FRAME, {"p50_ms": 0, "p99_ms": 0})
+            fps = 1000 / frame["p50_ms"] if frame["p50_ms"] else 0
+            lines = ["frame  p50 {:.2f} ms  p99 {:.2f} ms  ({:.0f} fps of work)".format(
+                frame["p50_ms"], frame["p99_ms"], fps)]
+            for name in sorted(summary, key=lambda stage: -summary[stage]["p99_ms"]):
+                lines.append("{}  p50 {:.2f} ms  p99 {:.2f} ms".format(name, summary[name]["p50_ms"],
+                                                                       summary[name]["p99_ms"]))
+            self.overlay_lines = tuple(lines)
+        return self.overlay_lines
+
+    def get_overlay_rect(self, font_size=18, padding=6):
+        """
+        Return the area of the overlay in the top left corner.
+        """
+        font = get_font(None, font_size)
+        lines = self.get_overlay_lines()
+        width = max(font.size(line)[0] for line in lines) + 2 * padding
+        return pygame.Rect(0, 0, width, font.get_linesize() * len(lines) + 2 * padding)
+
+    def draw_overlay(self, screen, font_size=18, padding=6):
+        """
+        Draw the overlay with the frame time and the cost of every stage.
+        """
+        font = get_font(None, font_size)
+        screen.fill((0, 0, 0), self.get_overlay_rect(font_size, padding))
+        y = padding
+        for line in self.get_overlay_lines():
+            # The text changes constantly, so it is not worth a place in the surface cache
+            screen.blit(font.render(line, True, (255, 255, 0)), (padding, y))
+            y += font.get_linesize()
+
+    def dump(self, path=None):
+        """
+        Write the summary and the raw samples of every stage to a JSON file.
+
+        Args:
+            path (str, optional): The file to write. Defaults to dump_path.
+
+        Returns:
+            None
+        """
+        path = path or self.dump_path
+        if not self.enabled or not path:
+            return
+        with self.lock:
+            samples = {name: [value / 1e6 for value in buffer.samples()] for name, buffer in self.buffers.items()}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as dump_file:
+            json.dump({"capacity": self.capacity, "summary": self.summary(), "samples_ms": samples}, dump_file,
+                      indent=4)
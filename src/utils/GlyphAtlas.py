@@ -0,0 +1,172 @@
+import pygame
+
+from src.utils.LRUCache import LRUCache
+
+
+class GlyphAtlas:
+    def __init__(self, max_glyphs=2048, max_layouts=256, max_lines=64):
+        """
+        Initialize an atlas of single rendered characters, used to draw text with a color per character.
+
+        Every (font, character, color, background) is rasterized once. A line is then composed from the atlas
+        with a single Surface.blits call, so changing the color of some characters costs no font rendering,
+        where a whole line rendered with font.render has to be rasterized again for every new combination of
+        colors. Glyphs rendered on the background color are opaque and blit about twice as fast as glyphs
+        with per-pixel alpha.
+
+        Composed lines are cached as well, so a line that did not change since the last frame is a single
+        opaque blit, and a keystroke only redraws the glyphs whose color changed.
+
+        Parameters:
+            max_glyphs (int, optional): The number of glyphs kept. The atlas is emptied when the limit is
+                reached, e.g. after several window resizes. Defaults to 2048.
+            max_layouts (int, optional): The size of the LRUCache of character offsets. Defaults to 256.
+            max_lines (int, optional): The size of the LRUCache of composed lines. Defaults to 64.
+        """
+        self.max_glyphs = max_glyphs
+        self.glyphs = {}
+        self.layouts = LRUCache(max_layouts)
+        self.lines = LRUCache(max_lines)
+
+    def get_glyph(self, font, char, color, background=None):
+        """
+        Return the rendered character, rasterizing it only on the first request.
+
+        The returned surface is shared, callers must blit it and never draw onto it.
+
+        Args:
+            font (pygame.font.Font): The font used for rendering.
+            char (str): The character to render.
+            color (tuple): The color of the character.
+            background (tuple, optional): The color the character is drawn on, None for a transparent
+                background. Defaults to None.
+
+        Returns:
+            tuple: The rendered character, and how far it reaches left of its position, for glyphs like "j".
+        """
+        key = (font, char, color, background)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            if len(self.glyphs) >= self.max_glyphs:
+                self.glyphs.clear()
+            surface = font.render(char, True, color, background)
+            if pygame.display.get_surface() is not None:
+                # Blitting in the format of the screen is faster than converting on every blit
+                surface = surface.convert() if background else surface.convert_alpha()
+            metrics = font.metrics(char)[0]
+            glyph = self.glyphs[key] = (surface, min(metrics[0], 0) if metrics else 0)
+        return glyph
+
+    def get_offsets(self, font, line):
+        """
+        Return where every character of a line starts, measured once per font and line.
+
+        The offsets add up the advance of every glyph, as the characters are placed one by one. Characters the
+        font has no metrics for are measured on their own.
+
+        Args:
+            font (pygame.font.Font): The font used for measuring.
+            line (str): The line to measure.
+
+        Returns:
+            list: The x offset of every character, followed by the width of the line.
+        """
+        key = (font, line)
+        offsets = self.layouts.get(key)
+        if offsets is None:
+            offsets = [0]
+            for char, metrics in zip(line, font.metrics(line)):
+                offsets.append(offsets[-1] + (metrics[4] if metrics else font.size(char)[0]))
+            self.layouts.put(key, offsets)
+        return offsets
+
+    def get_width(self, font, line):
+        """
+        Return the width of a line composed from the atlas.
+        """
+        return self.get_offsets(font, line)[-1]
+
+    def draw(self, surface, font, line, colors, position, background=None):
+        """
+        Draw a line with a color per character. Spaces are skipped, they have nothing to draw.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            font (pygame.font.Font): The font used for rendering.
+            line (str): The line to draw.
+            colors (list): The color of every character of the line.
+            position (tuple): The top left corner of the line.
+            background (tuple, optional): The solid color behind the line, which makes the glyphs opaque.
+                Defaults to None.
+
+        Returns:
+            None
+        """
+        self.draw_range(surface, font, line, colors, position, background, 0, len(line))
+
+    def draw_range(self, surface, font, line, colors, position, background, first, last):
+        """
+        Draw the characters first to last (exclusive) of a line at their place in the line.
+        """
+        offsets = self.get_offsets(font, line)
+        left, top = position
+        blits = []
+        for index in range(first, last):
+            char = line[index]
+            if char != " ":
+                glyph, shift = self.get_glyph(font, char, colors[index], background)
+                blits.append((glyph, (left + offsets[index] + shift, top)))
+        surface.blits(blits, doreturn=False)
+
+    def compose(self, font, line, colors, background):
+        """
+        Return a line with a color per character on a surface of its own.
+
+        Every line keeps its surface and the colors it was drawn with. When the colors change, only the changed
+        characters and their neighbours, whose glyphs may reach into them, are drawn again, so typing a
+        character costs a few blits instead of composing the whole line.
+
+        The returned surface is shared and changes when the line is composed again, callers must blit it right
+        away and never draw onto it.
+
+        Args:
+            font (pygame.font.Font): The font used for rendering.
+            line (str): The line to draw.
+            colors (list): The color of every character of the line.
+            background (tuple): The solid color behind the line.
+
+        Returns:
+            pygame.Surface: The opaque line, as wide as get_width and as high as the font.
+        """
+        key = (font, line, background)
+        entry = self.lines.get(key)
+        if entry is None:
+            # A new surface already has the pixel format of the screen
+            surface = pygame.Surface((max(self.get_width(font, line), 1), font.get_height()))
+            surface.fill(background)
+            self.draw(surface, font, line, colors, (0, 0), background)
+            self.lines.put(key, (surface, list(colors)))
+            return surface
+
+        surface, drawn_colors = entry
+        if drawn_colors == colors:
+            return surface
+        changed = [index for index, (drawn, color) in enumerate(zip(drawn_colors, colors)) if drawn != color]
+        first = max(changed[0] - 1, 0)
+        last = min(changed[-1] + 2, len(line))
+        offsets = self.get_offsets(font, line)
+        surface.fill(background, (offsets[first], 0, offsets[last] - offsets[first], surface.get_height()))
+        self.draw_range(surface, font, line, colors, (0, 0), background, first, last)
+        drawn_colors[:] = colors
+        return surface
+
+    def clear(self):
+        """
+        Drop every glyph, every measured line and every composed line.
+        """
+        self.glyphs.clear()
+        self.layouts.clear()
+        self.lines.clear()
+
+
+glyph_atlas = GlyphAtlas()
@@ -0,0 +1,158 @@
+import statistics
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+
+class KeystrokeRecorder:
+    MAGIC = b"STKR"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBIq")
+
+    def __init__(self):
+        """
+        Initialize an empty recorder for the keystrokes of one typing session.
+
+        The data is kept in typed arrays, one entry per keystroke: the time in nanoseconds from
+        time.perf_counter_ns, the pygame key code, the code point of the expected character (0 if there is
+        none) and whether the keystroke matched the expected character.
+        """
+        self.timestamps = array("q")
+        self.keys = array("I")
+        self.expected = array("I")
+        self.correct = array("B")
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def record(self, key, expected_char, correct, timestamp_ns=None):
+        """
+        Record a keystroke.
+
+        Args:
+            key (int): The pygame key code of the pressed key.
+            expected_char (str): The character the user was expected to type, or an empty string.
+            correct (bool): Whether the keystroke produced the expected character.
+            timestamp_ns (int, optional): The time of the keystroke in nanoseconds. Defaults to
+                time.perf_counter_ns().
+
+        Returns:
+            None
+        """
+        self.timestamps.append(time.perf_counter_ns() if timestamp_ns is None else timestamp_ns)
+        self.keys.append(key)
+        self.expected.append(ord(expected_char) if expected_char else 0)
+        self.correct.append(1 if correct else 0)
+
+    def clear(self):
+        """
+        Remove every recorded keystroke.
+        """
+        for column in (self.timestamps, self.keys, self.expected, self.correct):
+            del column[:]
+
+    def intervals(self):
+        """
+        Return the time between consecutive keystrokes in nanoseconds.
+
+        Returns:
+            array: The inter-key intervals, one less than the number of keystrokes.
+        """
+        return array("q", (b - a for a, b in zip(self.timestamps, self.timestamps[1:])))
+
+    def interval_stats(self):
+        """
+        Summarize the time between consecutive keystrokes.
+
+        Returns:
+            dict: The number of intervals and their mean, median, standard deviation, minimum and maximum in
+            milliseconds. The values are 0 when fewer than two keystrokes were recorded.
+        """
+        intervals = [interval / 1e6 for interval in self.intervals()]
+        if not intervals:
+            return {"count": 0, "mean_ms": 0, "median_ms": 0, "stdev_ms": 0, "min_ms": 0, "max_ms": 0}
+        return {
+            "count": len(intervals),
+            "mean_ms": statistics.fmean(intervals),
+            "median_ms": statistics.median(intervals),
+            "stdev_ms": statistics.pstdev(intervals),
+            "min_ms": min(intervals),
+            "max_ms": max(intervals),
+        }
+
+    def to_bytes(self):
+        """
+        Serialize the recording into a compact binary format.
+
+        The header holds the number of keystrokes and the first timestamp, followed by the intervals in
+        microseconds and the key, expected character and correctness columns, all little-endian and
+        compressed with zlib.
+
+        Returns:
+            bytes: The serialized recording.
+        """
+        first = self.timestamps[0] if self.timestamps else 0
+        deltas = array("I", (min((b - a) // 1000, 0xFFFFFFFF)
+                             for a, b in zip([first] + list(self.timestamps), self.timestamps)))
+        columns = [deltas, array("I", self.keys), array("I", self.expected)]
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+        payload = b"".join(column.tobytes() for column in columns) + self.correct.tobytes()
+        return self.HEADER.pack(self.MAGIC, self.VERSION, len(self), first) + zlib.compress(payload)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Restore a recording serialized with to_bytes.
+
+        Timestamps are restored with microsecond precision.
+
+        Args:
+            data (bytes): The serialized recording.
+
+        Returns:
+            KeystrokeRecorder: The restored recording.
+        """
+        magic, version, count, first = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not a keystroke recording")
+        payload = zlib.decompress(data[cls.HEADER.size:])
+
+        columns = []
+        offset = 0
+        for _ in range(3):
+            column = array("I")
+            column.frombytes(payload[offset:offset + count * column.itemsize])
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns.append(column)
+            offset += count * column.itemsize
+        deltas, keys, expected = columns
+
+        recorder = cls()
+        timestamp = first
+        for delta in deltas:
+            timestamp += delta * 1000
+            recorder.timestamps.append(timestamp)
+        recorder.keys = keys
+        recorder.expected = expected
+        recorder.correct.frombytes(payload[offset:offset + count])
+        return recorder
+
+    def save(self, path):
+        """
+        Write the serialized recording to a file.
+        """
+        with open(path, "wb") as recording_file:
+            recording_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a recording written with save.
+        """
+        with open(path, "rb") as recording_file:
+            return cls.from_bytes(recording_file.read())
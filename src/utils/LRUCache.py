@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, max_size):
+        """
+        Initialize a mapping that keeps the most recently used entries, shared by the caches of the renderer.
+
+        Reading an entry marks it as recently used. When an entry is added to a full cache, the least recently
+        used one is dropped. Lookups are counted as hits and misses.
+
+        Parameters:
+            max_size (int): The maximum number of entries.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the value stored for the key and mark it as recently used.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            The stored value, None if the key is not cached.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value as the most recently used entry, dropping the least recently used one if the cache is full.
+
+        Returns:
+            The stored value.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """
+        Drop every entry and reset the hit and miss counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,69 @@
+import time
+
+from src.utils.DBWorker import report_exception
+
+
+class LeaderboardCache:
+    def __init__(self, fetch, db_worker, ttl=30):
+        """
+        Initialize the cache in front of the leaderboard queries.
+
+        The leaderboard is always rendered from memory. Once the cached scores are older than the TTL or were
+        invalidated, they keep being served while fresh scores are fetched in the background
+        (stale-while-revalidate).
+
+        Parameters:
+            fetch (callable): Fetches the scores from the database, runs on the database worker.
+            db_worker (DBWorker): The worker the scores are fetched on.
+            ttl (float, optional): The number of seconds the scores are considered fresh. Defaults to 30.
+        """
+        self.fetch = fetch
+        self.db_worker = db_worker
+        self.ttl = ttl
+        self.scores = None
+        self.fetched_at = 0
+        self.future = None
+        self.generation = 0
+        self.future_generation = 0
+
+    def get(self):
+        """
+        Return the cached scores and start a background refresh if they are stale.
+
+        Returns:
+            The scores returned by fetch, or None until the first fetch finished.
+        """
+        if self.is_stale() and self.future is None:
+            self.future_generation = self.generation
+            self.future = self.db_worker.submit(self.fetch)
+            self.future.add_done_callback(report_exception)
+        return self.scores
+
+    def is_stale(self):
+        """
+        Return True if the scores were never fetched, are older than the TTL or were invalidated.
+        """
+        return self.fetched_at == 0 or time.monotonic() - self.fetched_at > self.ttl
+
+    def invalidate(self):
+        """
+        Mark the scores as stale, e.g. after a new score was inserted. A fetch that is already running may
+        miss the new score, so its result is served but refreshed again.
+        """
+        self.generation += 1
+        self.fetched_at = 0
+
+    def poll(self):
+        """
+        Store the result of a finished background fetch. Called once per frame.
+        """
+        if self.future is None or not self.future.done():
+            return
+        future, self.future = self.future, None
+        if future.cancelled() or future.exception() is not None:
+            # Retry after the TTL instead of hammering an unreachable database
+            self.fetched_at = time.monotonic()
+            return
+        self.scores = future.result()
+        if self.future_generation == self.generation:
+            self.fetched_at = time.monotonic()
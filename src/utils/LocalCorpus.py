@@ -0,0 +1,216 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+
+
+class LocalCorpus:
+    MAGIC = b"STCI"
+    VERSION = 2
+    HEADER = struct.Struct("<4sHQqI")
+    GROUP = struct.Struct("<IQQ")
+    OFFSET = struct.Struct("<Q")
+
+    def __init__(self, text_path, index_path=None):
+        """
+        Open a local sentence corpus for sampling.
+
+        The corpus is a UTF-8 text file with one sentence per line. Its index lists the byte offset of every
+        sentence grouped by word count. Both files are memory-mapped, so opening the corpus only reads the
+        small group table and sampling touches just the pages of the chosen sentences. The index records the size
+        and modification time of the text file it was built from and is refused once the text file changed.
+
+        Parameters:
+            text_path (str): The path to the corpus text file.
+            index_path (str, optional): The path to the index built by build_index. Defaults to the text path
+                with the ".idx" extension.
+        """
+        self.text_path = text_path
+        self.index_path = index_path or os.path.splitext(text_path)[0] + ".idx"
+        self.groups = {}
+        self.offsets_start = 0
+        self.text_file = open(self.text_path, "rb")
+        self.index_file = open(self.index_path, "rb")
+        self.text = self.map_file(self.text_file)
+        self.index = self.map_file(self.index_file)
+
+        if len(self.index) < self.HEADER.size:
+            raise ValueError("{} is not a sentence corpus index".format(self.index_path))
+        magic, version, text_size, text_mtime, group_count = self.HEADER.unpack_from(self.index)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("{} is not a sentence corpus index".format(self.index_path))
+        if (text_size, text_mtime) != self.text_signature(self.text_file):
+            raise ValueError("{} was built from an older version of {}".format(self.index_path, self.text_path))
+        position = self.HEADER.size
+        for _ in range(group_count):
+            word_count, first, length = self.GROUP.unpack_from(self.index, position)
+            self.groups[word_count] = (first, length)
+            position += self.GROUP.size
+        self.offsets_start = position
+
+    @classmethod
+    def open(cls, text_path, index_path=None):
+        """
+        Open a corpus, building its index first if it does not exist yet or no longer matches the text file.
+
+        Args:
+            text_path (str): The path to the corpus text file.
+            index_path (str, optional): The path to the index. Defaults to the text path with the ".idx" extension.
+
+        Returns:
+            LocalCorpus: The opened corpus.
+        """
+        index_path = index_path or os.path.splitext(text_path)[0] + ".idx"
+        if not cls.is_index_current(text_path, index_path):
+            cls.build_index(text_path, index_path)
+        return cls(text_path, index_path)
+
+    @classmethod
+    def is_index_current(cls, text_path, index_path):
+        """
+        Whether the index exists, has the current format and was built from the text file as it is now.
+        """
+        try:
+            with open(index_path, "rb") as index_file:
+                header = index_file.read(cls.HEADER.size)
+            with open(text_path, "rb") as text_file:
+                signature = cls.text_signature(text_file)
+        except OSError:
+            return False
+        if len(header) < cls.HEADER.size:
+            return False
+        magic, version, text_size, text_mtime, group_count = cls.HEADER.unpack(header)
+        return magic == cls.MAGIC and version == cls.VERSION and (text_size, text_mtime) == signature
+
+    @staticmethod
+    def text_signature(file):
+        """
+        Return the size and the modification time in nanoseconds of an open text file, stored in the index.
+        """
+        stat = os.fstat(file.fileno())
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def map_file(file):
+        """
+        Memory-map a file for reading. Empty files cannot be mapped and are returned as empty bytes.
+        """
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def build_index(cls, text_path, index_path=None):
+        """
+        Build the offset index of a corpus text file in a single streaming pass.
+
+        Args:
+            text_path (str): The path to the corpus text file, one sentence per line.
+            index_path (str, optional): The path of the index to write. Defaults to the text path with the
+                ".idx" extension.
+
+        Returns:
+            str: The path of the written index.
+        """
+        index_path = index_path or os.path.splitext(text_path)[0] + ".idx"
+        groups = {}
+        offset = 0
+        with open(text_path, "rb") as text_file:
+            # Taken before reading, so a change while the index is built makes the index stale
+            text_size, text_mtime = cls.text_signature(text_file)
+            for line in text_file:
+                word_count = len(line.split())
+                if word_count:
+                    groups.setdefault(word_count, array("Q")).append(offset)
+                offset += len(line)
+
+        with open(index_path, "wb") as index_file:
+            index_file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, text_size, text_mtime, len(groups)))
+            first = 0
+            for word_count in sorted(groups):
+                index_file.write(cls.GROUP.pack(word_count, first, len(groups[word_count])))
+                first += len(groups[word_count])
+            for word_count in sorted(groups):
+                offsets = groups[word_count]
+                if sys.byteorder == "big":
+                    offsets.byteswap()
+                offsets.tofile(index_file)
+        return index_path
+
+    def word_counts(self):
+        """
+        Return the word counts available in the corpus.
+        """
+        return sorted(self.groups)
+
+    def get_sentence(self, word_count, number):
+        """
+        Read a sentence of the given word count group.
+
+        Args:
+            word_count (int): The word count group.
+            number (int): The position of the sentence within the group.
+
+        Returns:
+            str: The sentence.
+        """
+        first, length = self.groups[word_count]
+        offset, = self.OFFSET.unpack_from(self.index, self.offsets_start + (first + number) * self.OFFSET.size)
+        end = self.text.find(b"\n", offset)
+        if end == -1:
+            end = len(self.text)
+        return self.text[offset:end].decode("utf-8").strip()
+
+    def get_random_sentence_by_word_count(self, count):
+        """
+        Retrieves a random sentence with the specified word count.
+
+        Args:
+            count (int): The word count of the desired sentence.
+
+        Returns:
+            str or None: The randomly selected sentence, or None if no such sentence is found.
+        """
+        sentences = self.get_random_sentences_by_word_count(count, 1)
+        return sentences[0] if sentences else None
+
+    def get_random_sentences_by_word_count(self, count, amount):
+        """
+        Retrieves up to the given amount of distinct random sentences with the specified word count.
+
+        Args:
+            count (int): The word count of the desired sentences.
+            amount (int): The number of sentences to retrieve.
+
+        Returns:
+            list: The randomly selected sentences, empty if no sentence has the specified word count.
+        """
+        if count not in self.groups:
+            return []
+        length = self.groups[count][1]
+        return [self.get_sentence(count, number) for number in random.sample(range(length), min(amount, length))]
+
+    def close(self):
+        """
+        Unmap and close the corpus files.
+        """
+        for mapped in (self.text, self.index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self.text_file.close()
+        self.index_file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offset index of a local sentence corpus.")
+    parser.add_argument("text_path", help="The corpus text file, one sentence per line.")
+    parser.add_argument("index_path", nargs="?", help="The index to write, defaults to the text path with .idx.")
+    args = parser.parse_args()
+    print("Index written to {}".format(LocalCorpus.build_index(args.text_path, args.index_path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+class PrefixWidths:
+    def __init__(self):
+        """
+        Initialize the prefix widths of an editable line of text, used to place the cursor.
+
+        offsets[i] is the rendered width of text[:i], measured with the whole prefix so kerning and the
+        fractional pen positions of the font are included. Summing the widths of single characters or pairs
+        drifts by a pixel every dozen characters or so. An edit only drops the offsets after the edited
+        position and the missing offsets are measured when they are needed, so typing at the end of the line
+        costs one measurement per character and placing the cursor costs a lookup.
+        """
+        self.text = ""
+        self.font = None
+        self.offsets = [0]
+
+    def insert(self, text, index):
+        """
+        Take the text after a character was inserted.
+
+        Args:
+            text (str): The text including the new character.
+            index (int): The position of the new character. It is negative when the character was typed just
+                before the text, e.g. the space that moves the long text viewport to the next line.
+
+        Returns:
+            None
+        """
+        self.text = text
+        del self.offsets[max(index, 0) + 1:]
+
+    def delete(self, text, index):
+        """
+        Take the text after a character was removed.
+
+        Args:
+            text (str): The text without the removed character.
+            index (int): The position the character was removed from.
+
+        Returns:
+            None
+        """
+        self.text = text
+        del self.offsets[max(index, 0) + 1:]
+
+    def update(self, text):
+        """
+        Take a text that was replaced without insert or delete, e.g. on a restart. The offsets of a common
+        start are kept when one text extends the other.
+        """
+        if text is self.text:
+            return
+        if self.text.startswith(text):
+            del self.offsets[len(text) + 1:]
+        elif not text.startswith(self.text):
+            del self.offsets[1:]
+        self.text = text
+
+    def width(self, position, font):
+        """
+        Return the rendered width of the text up to a position.
+
+        Args:
+            position (int): The number of characters measured, clamped to the length of the text.
+            font (pygame.font.Font): The font the text is rendered with. When it changes, e.g. after a resize,
+                every offset is measured again.
+
+        Returns:
+            int: The width in pixels.
+        """
+        if font is not self.font:
+            self.font = font
+            del self.offsets[1:]
+        position = min(position, len(self.text))
+        for index in range(len(self.offsets), position + 1):
+            self.offsets.append(font.size(self.text[:index])[0])
+        return self.offsets[position]
@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import pygame
+
+from src.utils.FrameProfiler import percentile
+from src.utils.KeystrokeRecorder import KeystrokeRecorder
+
+SEED_WORDS = ("the quick brown fox jumps over lazy dog while seven wizards quietly pack boxes of liquor "
+              "and jugs made from mixed zinc").split()
+
+
+def key_for_char(char):
+    """
+    Return the pygame key code a character is typed with, 0 for characters without their own key.
+    """
+    if len(char) == 1 and 32 <= ord(char) < 127:
+        return ord(char.lower())
+    return 0
+
+
+def synthetic_keystrokes(text, wpm=80, error_rate=0.0, seed=0, press_return=True):
+    """
+    Generate the keystrokes of a typist typing a text at a steady speed.
+
+    Args:
+        text (str): The text to type.
+        wpm (float, optional): The typing speed, five characters count as a word. Defaults to 80.
+        error_rate (float, optional): The share of characters that are first mistyped and corrected with
+            backspace. Defaults to 0.0.
+        seed (int, optional): The seed of the mistakes, so runs are repeatable. Defaults to 0.
+        press_return (bool, optional): Finish the test with the return key. Defaults to True.
+
+    Returns:
+        list: Tuples of (offset_ms, key, unicode) in typing order.
+    """
+    rng = random.Random(seed)
+    interval_ms = 60000 / (wpm * 5)
+    keystrokes = []
+    offset = 0.0
+    for char in text:
+        if error_rate and rng.random() < error_rate:
+            wrong = rng.choice("abcdefghijklmnopqrstuvwxyz".replace(char.lower(), ""))
+            keystrokes.append((offset, key_for_char(wrong), wrong))
+            offset += interval_ms
+            keystrokes.append((offset, pygame.K_BACKSPACE, "\b"))
+            offset += interval_ms
+        keystrokes.append((offset, key_for_char(char), char))
+        offset += interval_ms
+    if press_return:
+        keystrokes.append((offset, pygame.K_RETURN, "\r"))
+    return keystrokes
+
+
+def recorded_keystrokes(recorder):
+    """
+    Turn a KeystrokeRecorder session back into keystrokes with their original timing.
+
+    The recording keeps the key codes, so the typed character is taken from the expected character of the
+    correct keystrokes and from the key code otherwise.
+
+    Args:
+        recorder (KeystrokeRecorder): The recorded session.
+
+    Returns:
+        list: Tuples of (offset_ms, key, unicode) in typing order.
+    """
+    if not len(recorder):
+        return []
+    start = recorder.timestamps[0]
+    keystrokes = []
+    for timestamp, key, expected, correct in zip(recorder.timestamps, recorder.keys, recorder.expected,
+                                                  recorder.correct):
+        if correct and expected:
+            char = chr(expected)
+        elif key == pygame.K_BACKSPACE:
+            char = "\b"
+        elif key == pygame.K_RETURN:
+            char = "\r"
+        elif 32 <= key < 127:
+            char = chr(key)
+        else:
+            char = ""
+        keystrokes.append(((timestamp - start) / 1e6, key, char))
+    return keystrokes
+
+
+def summarize_frame_times(frame_times):
+    """
+    Summarize frame times given in milliseconds.
+
+    Returns:
+        dict: The number of frames and their mean, p50, p90, p99 and maximum in milliseconds.
+    """
+    return {
+        "frames": len(frame_times),
+        "mean_ms": statistics.fmean(frame_times) if frame_times else 0,
+        "p50_ms": percentile(frame_times, 50),
+        "p90_ms": percentile(frame_times, 90),
+        "p99_ms": percentile(frame_times, 99),
+        "max_ms": max(frame_times, default=0),
+    }
+
+
+class ReplayDriver:
+    def __init__(self, game, fps=60, speed=1.0, realtime=False):
+        """
+        Initialize a driver that feeds scripted keystrokes into a game and measures its frames.
+
+        The driver runs the game loop itself, one run_frame per simulated frame. Keystrokes are posted to the
+        pygame event queue once their offset is reached, so they go through handle_events like real input.
+
+        Parameters:
+            game (SlaveType): The game, usually created with headless=True.
+            fps (int, optional): The simulated frame rate. Defaults to 60.
+            speed (float, optional): Replay the keystrokes this many times faster. Defaults to 1.0.
+            realtime (bool, optional): Sleep between frames to run at the frame rate instead of as fast as
+                possible. Defaults to False.
+        """
+        self.game = game
+        self.frame_ms = 1000 / fps
+        self.speed = speed
+        self.realtime = realtime
+        self.frame_times = []
+
+    def wait_for_words(self, timeout=10.0):
+        """
+        Run frames until the sentence of the test is loaded.
+
+        Returns:
+            bool: Whether the sentence arrived before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while not self.game.words and time.monotonic() < deadline:
+            self.game.run_frame()
+            time.sleep(0.001)
+        return bool(self.game.words)
+
+    def run(self, keystrokes, tail_frames=30):
+        """
+        Replay the keystrokes and record the time every frame took.
+
+        Args:
+            keystrokes (list): Tuples of (offset_ms, key, unicode), e.g. from synthetic_keystrokes.
+            tail_frames (int, optional): Frames run after the last keystroke. Defaults to 30.
+
+        Returns:
+            dict: The frame time summary, see summarize_frame_times.
+        """
+        self.frame_times = []
+        pending = sorted(keystrokes, key=lambda keystroke: keystroke[0])
+        position = 0
+        now_ms = 0.0
+        remaining_tail = tail_frames
+        while position < len(pending) or remaining_tail > 0:
+            while position < len(pending) and pending[position][0] / self.speed <= now_ms:
+                offset, key, char = pending[position]
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=char, mod=0, scancode=0))
+                position += 1
+            if position >= len(pending):
+                remaining_tail -= 1
+
+            started = time.perf_counter()
+            self.game.run_frame()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.frame_times.append(elapsed_ms)
+
+            if self.realtime and elapsed_ms < self.frame_ms:
+                time.sleep((self.frame_ms - elapsed_ms) / 1000)
+            now_ms += self.frame_ms
+        return summarize_frame_times(self.frame_times)
+
+
+def seed_sentences(db, word_counts=(10, 20, 50), per_word_count=10, seed=0):
+    """
+    Fill an empty database with generated sentences, so a replay needs no prepared data.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for word_count in word_counts:
+        if db.get_sentence_ids_by_word_count(word_count):
+            continue
+        for _ in range(per_word_count):
+            rows.append((" ".join(rng.choice(SEED_WORDS) for _ in range(word_count)), word_count))
+    db.insert_sentences(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay keystrokes into a headless SlaveType and report frame "
+                                                 "time percentiles.")
+    parser.add_argument("--keys", help="Replay a session recorded by KeystrokeRecorder instead of a synthetic one.")
+    parser.add_argument("--wpm", type=float, default=80, help="Speed of the synthetic typist.")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of mistyped characters.")
+    parser.add_argument("--words", type=int, default=50, choices=(10, 20, 50, 200, 500, 1000),
+                        help="Length of the test.")
+    parser.add_argument("--fps", type=int, default=60, help="Simulated frame rate.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay the keystrokes faster by this factor.")
+    parser.add_argument("--realtime", action="store_true", help="Run at the frame rate instead of flat out.")
+    parser.add_argument("--sqlite", default=":memory:", help="SQLite database to use, seeded with sentences if "
+                                                               "empty. Defaults to an in-memory database.")
+    parser.add_argument("--json", help="Also write the summary to this file.")
+    args = parser.parse_args()
+
+    sqlite_path = args.sqlite if args.sqlite == ":memory:" else os.path.abspath(args.sqlite)
+    from src.Game import SlaveType
+    from src.SQLiteDB import SQLiteDatabase
+
+    db = SQLiteDatabase(sqlite_path)
+    seed_sentences(db)
+    game = SlaveType(db=db, headless=True)
+    game.show_login_screen = False
+    game.restart(args.words)
+
+    driver = ReplayDriver(game, fps=args.fps, speed=args.speed, realtime=args.realtime)
+    if not driver.wait_for_words():
+        print("No sentence with {} words could be loaded".format(args.words))
+        sys.exit(1)
+    if args.keys:
+        keystrokes = recorded_keystrokes(KeystrokeRecorder.load(args.keys))
+    else:
+        keystrokes = synthetic_keystrokes(game.words, wpm=args.wpm, error_rate=args.error_rate)
+    summary = driver.run(keystrokes)
+    summary["keystrokes"] = len(keystrokes)
+    game.shutdown()
+    pygame.quit()
+
+    print("{frames} frames, {keystrokes} keystrokes: mean {mean_ms:.3f} ms, p50 {p50_ms:.3f} ms, "
+          "p90 {p90_ms:.3f} ms, p99 {p99_ms:.3f} ms, max {max_ms:.3f} ms".format(**summary))
+    if args.json:
+        with open(args.json, "w") as summary_file:
+            json.dump(summary, summary_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
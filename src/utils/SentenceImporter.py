@@ -0,0 +1,211 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+MAX_CARRIED_LENGTH = 10000
+KEYBOARD_CHARACTERS = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+    "\u2013": "-", "\u2014": "-", "\u2026": "...", "\u00a0": " ",
+})
+
+
+def normalize(text):
+    """
+    Normalize a sentence: NFC unicode, typographic quotes and dashes replaced by the characters found on a
+    keyboard and whitespace collapsed to single spaces.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = text.translate(KEYBOARD_CHARACTERS)
+    return " ".join(text.split())
+
+
+def split_sentences(lines):
+    """
+    Split lines into normalized sentences ending with ".", "!" or "?".
+
+    A line may hold several sentences, and a sentence may continue on the next lines, as in hard-wrapped prose:
+    the unterminated end of a line is carried over to the next one. A blank line ends the paragraph, so
+    unterminated text such as a heading is emitted there. Text carried over for longer than MAX_CARRIED_LENGTH
+    characters is emitted as it is, which bounds the memory used by text without punctuation.
+
+    Args:
+        lines (iterable): The lines to split, e.g. a text stream.
+
+    Yields:
+        str: The non-empty normalized sentences.
+    """
+    carried = ""
+    for line in lines:
+        line = normalize(line)
+        if not line:
+            if carried:
+                yield carried
+                carried = ""
+            continue
+        sentences = SENTENCE_END.split(carried + " " + line if carried else line)
+        carried = sentences.pop()
+        for sentence in sentences:
+            if sentence:
+                yield sentence
+        if carried.endswith((".", "!", "?")) or len(carried) > MAX_CARRIED_LENGTH:
+            yield carried
+            carried = ""
+    if carried:
+        yield carried
+
+
+def sentence_hash(sentence):
+    """
+    Return the 16 byte content hash a sentence is deduplicated by.
+    """
+    return hashlib.blake2b(sentence.encode("utf-8"), digest_size=16).digest()
+
+
+class SentenceImporter:
+    def __init__(self, db, chunk_size=5000, min_words=1, max_words=None, progress_every=100000):
+        """
+        Initialize a bulk importer that streams sentences into the database.
+
+        Sentences are deduplicated by content hash against each other and against the sentences already
+        stored, and inserted in chunks of chunk_size rows, one transaction per chunk.
+
+        Parameters:
+            db (DatabaseBackend): The database the sentences are inserted into.
+            chunk_size (int, optional): The number of sentences inserted per transaction. Defaults to 5000.
+            min_words (int, optional): Shorter sentences are skipped. Defaults to 1.
+            max_words (int, optional): Longer sentences are skipped. Defaults to None (no limit).
+            progress_every (int, optional): Report progress after this many read sentences, 0 disables the
+                reports. Defaults to 100000.
+        """
+        self.db = db
+        self.chunk_size = chunk_size
+        self.min_words = min_words
+        self.max_words = max_words
+        self.progress_every = progress_every
+        self.seen = set()
+        self.read = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.started_at = 0
+
+    def load_existing(self):
+        """
+        Remember the hashes of the sentences already stored, so importing the same file twice adds nothing.
+        """
+        for sentence in self.db.iter_sentences():
+            self.seen.add(sentence_hash(normalize(sentence)))
+
+    def rows(self, sentences):
+        """
+        Turn sentences into (sentence, word_count) rows, dropping duplicates and sentences outside the word
+        count limits.
+
+        Args:
+            sentences (iterable): The normalized sentences.
+
+        Yields:
+            tuple: The sentence and its word count.
+        """
+        for sentence in sentences:
+            self.read += 1
+            if self.progress_every and self.read % self.progress_every == 0:
+                self.report()
+            word_count = sentence.count(" ") + 1
+            if word_count < self.min_words or (self.max_words and word_count > self.max_words):
+                self.skipped += 1
+                continue
+            digest = sentence_hash(sentence)
+            if digest in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(digest)
+            yield sentence, word_count
+
+    def run(self, stream):
+        """
+        Import every sentence of a text stream.
+
+        Args:
+            stream (iterable): The text lines, e.g. an open file or sys.stdin.
+
+        Returns:
+            dict: The import statistics, see summary.
+        """
+        self.started_at = time.perf_counter()
+        self.load_existing()
+        chunk = []
+        for row in self.rows(split_sentences(stream)):
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self.inserted += self.db.insert_sentences(chunk)
+                chunk = []
+        self.inserted += self.db.insert_sentences(chunk)
+        return self.summary()
+
+    def summary(self):
+        """
+        Return the counters of the import and its throughput in sentences read per second.
+        """
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "read": self.read,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+            "seconds": round(elapsed, 3),
+            "sentences_per_second": round(self.read / elapsed) if elapsed > 0 else 0,
+        }
+
+    def report(self):
+        """
+        Print the progress of the import.
+        """
+        summary = self.summary()
+        print("Read {read} sentences, inserted {inserted}, {duplicates} duplicates, {skipped} skipped "
+              "({sentences_per_second} sentences/s)".format(**summary), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import sentences into the SlaveType database.")
+    parser.add_argument("text_path", nargs="?", default="-", help="The text file to import, - for stdin.")
+    parser.add_argument("--config", help="The database configuration, defaults to config/db_config.json.")
+    parser.add_argument("--sqlite", help="Import into this SQLite database instead of the configured one.")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Sentences inserted per transaction.")
+    parser.add_argument("--min-words", type=int, default=1, help="Skip sentences with fewer words.")
+    parser.add_argument("--max-words", type=int, help="Skip sentences with more words.")
+    args = parser.parse_args()
+
+    from src import DB
+    from src.Config import load_db_config
+    if args.config:
+        with open(args.config, "r") as config_file:
+            db_config = json.load(config_file)
+    else:
+        db_config = load_db_config()
+    if args.sqlite:
+        db_config = {"backend": "sqlite",
+                     "sqlite_path": args.sqlite if args.sqlite == ":memory:" else os.path.abspath(args.sqlite)}
+    db = DB.create_database(db_config)
+    importer = SentenceImporter(db, chunk_size=args.chunk_size, min_words=args.min_words,
+                                max_words=args.max_words)
+    try:
+        if args.text_path == "-":
+            summary = importer.run(sys.stdin)
+        else:
+            with open(args.text_path, "r", encoding="utf-8") as text_file:
+                summary = importer.run(text_file)
+    finally:
+        db.close()
+    print("Imported {inserted} of {read} sentences in {seconds} s ({sentences_per_second} sentences/s), "
+          "{duplicates} duplicates and {skipped} outside the word limits skipped".format(**summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import math
+import time
+from collections import deque
+
+from src.utils.DBWorker import report_exception
+
+
+class SentencePrefetcher:
+    def __init__(self, source, db_worker, word_counts=(10, 20, 50), buffer_size=5, low_water=2, retry_delay=1.0,
+                 long_word_counts=()):
+        """
+        Initialize the prefetcher that keeps a buffer of ready sentences for every difficulty.
+
+        Parameters:
+            source: The sentence source, an object with a get_random_sentences_by_word_count(count, amount) method.
+            db_worker (DBWorker): The worker the source is queried on.
+            word_counts (tuple, optional): The word counts that are prefetched up front. Defaults to (10, 20, 50).
+            buffer_size (int, optional): The number of sentences kept per word count. Defaults to 5.
+            low_water (int, optional): The buffer is refilled once it holds this many sentences or fewer.
+                Defaults to 2.
+            retry_delay (float, optional): Seconds to wait before asking again after a fetch returned nothing.
+                Defaults to 1.0.
+            long_word_counts (tuple, optional): Word counts of long texts, which are composed from sentences of
+                the largest word count in word_counts. Defaults to ().
+        """
+        self.source = source
+        self.db_worker = db_worker
+        self.word_counts = word_counts
+        self.buffer_size = buffer_size
+        self.low_water = low_water
+        self.retry_delay = retry_delay
+        self.long_word_counts = long_word_counts
+        self.buffers = {}
+        self.pending = {}
+        self.retry_at = {}
+
+    def prime(self):
+        """
+        Start filling the buffers of all configured word counts.
+        """
+        for word_count in self.word_counts + tuple(self.long_word_counts):
+            self.refill(word_count)
+
+    def take(self, word_count):
+        """
+        Take a ready sentence with the given word count and refill the buffer in the background if it runs low.
+
+        Args:
+            word_count (int): The word count of the sentence.
+
+        Returns:
+            str or None: The sentence, or None if the buffer is empty and the caller has to poll again later.
+        """
+        buffer = self.buffers.setdefault(word_count, deque())
+        sentence = buffer.popleft() if buffer else None
+        if len(buffer) <= self.low_water:
+            self.refill(word_count)
+        return sentence
+
+    def refill(self, word_count):
+        """
+        Fetch sentences for the given word count in the background unless a fetch is already running or
+        the previous fetch came back empty less than retry_delay seconds ago.
+
+        Args:
+            word_count (int): The word count to fetch.
+
+        Returns:
+            None
+        """
+        if word_count in self.pending or time.monotonic() < self.retry_at.get(word_count, 0):
+            return
+        missing = self.buffer_size - len(self.buffers.setdefault(word_count, deque()))
+        if missing <= 0:
+            return
+        if word_count in self.long_word_counts:
+            future = self.db_worker.submit(self.compose_texts, word_count, missing)
+        else:
+            future = self.db_worker.submit(self.source.get_random_sentences_by_word_count, word_count, missing)
+        future.add_done_callback(report_exception)
+        self.pending[word_count] = future
+
+    def compose_texts(self, word_count, amount):
+        """
+        Build long texts from random sentences of the largest prefetched word count. Runs on the worker.
+
+        Args:
+            word_count (int): The word count of every text.
+            amount (int): The number of texts wanted.
+
+        Returns:
+            list: Up to amount texts with single spaces between the words. When the source has too few
+                sentences, their words are repeated to fill a text. Empty if the source has none.
+        """
+        sentence_words = max(self.word_counts)
+        sentences = self.source.get_random_sentences_by_word_count(
+            sentence_words, amount * math.ceil(word_count / sentence_words))
+        words = " ".join(sentences).split()
+        if not words:
+            return []
+        return [" ".join(words[(number * word_count + index) % len(words)] for index in range(word_count))
+                for number in range(max(1, min(amount, len(words) // word_count)))]
+
+    def poll(self):
+        """
+        Move the results of finished fetches into the buffers. Called once per frame.
+        """
+        for word_count, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[word_count]
+            sentences = [] if future.cancelled() or future.exception() else future.result()
+            if sentences:
+                self.buffers[word_count].extend(sentences)
+            else:
+                self.retry_at[word_count] = time.monotonic() + self.retry_delay
@@ -0,0 +1,58 @@
+class Session:
+    def __init__(self, user_id, username, best_wpm=None):
+        """
+        Initialize the session of a logged in user.
+
+        The session is built once at login and keeps the identity and the personal best of the user, so saving
+        a result or highlighting the user on the leaderboard does not need another database lookup.
+
+        Parameters:
+            user_id (int): The ID of the user.
+            username (str): The name of the user.
+            best_wpm (float, optional): The best WPM of the user so far. Defaults to None (no result yet).
+        """
+        self.user_id = user_id
+        self.username = username
+        self.best_wpm = best_wpm
+        self.games_played = 0
+
+    @classmethod
+    def authenticate(cls, db, username, password):
+        """
+        Check the credentials and build the session of the user in a single query. Runs on the database worker.
+
+        Args:
+            db (DatabaseBackend): The database the user is looked up in.
+            username (str): The name of the user.
+            password (str): The password of the user.
+
+        Returns:
+            Session or None: The session if the credentials are valid, None otherwise.
+        """
+        user = db.authenticate_user(username, password)
+        if user is None:
+            return None
+        user_id, best_wpm = user
+        return cls(user_id, username, best_wpm)
+
+    def record_result(self, wpm):
+        """
+        Count a finished game and update the personal best.
+
+        Args:
+            wpm (float): The WPM of the game.
+
+        Returns:
+            bool: True if the game is a new personal best.
+        """
+        self.games_played += 1
+        if self.best_wpm is None or wpm > self.best_wpm:
+            self.best_wpm = wpm
+            return True
+        return False
+
+    def is_current_user(self, username):
+        """
+        Return True if the given username belongs to this session, e.g. for a leaderboard row.
+        """
+        return username == self.username
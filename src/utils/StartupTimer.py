@@ -0,0 +1,56 @@
+import time
+
+
+class StartupTimer:
+    def __init__(self):
+        """
+        Initialize the timer of the startup phases. The clock starts when this module is imported, which the
+        entry point does before anything else.
+        """
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        self.finished = False
+
+    def mark(self, phase):
+        """
+        End a startup phase and record how long it took.
+
+        Args:
+            phase (str): The name of the phase that just finished.
+
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def total_ms(self):
+        """
+        Return the time since the timer started in milliseconds.
+        """
+        return (self.last - self.started) * 1000
+
+    def finish(self, phase="first frame", report=False):
+        """
+        End the last startup phase, e.g. once the first frame is on screen. Later calls do nothing, so the
+        main loop can call it every frame.
+
+        Args:
+            phase (str, optional): The name of the last phase. Defaults to "first frame".
+            report (bool, optional): Print the duration of every phase and the total. Defaults to False.
+
+        Returns:
+            None
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self.mark(phase)
+        if report:
+            phases = ", ".join("{} {:.0f} ms".format(name, duration) for name, duration in self.phases)
+            print("Startup: {} (total {:.0f} ms)".format(phases, self.total_ms()))
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,146 @@
+class StatisticsTracker:
+    def __init__(self, target=""):
+        """
+        Initialize the tracker that keeps the number of correctly and incorrectly typed characters up to date
+        as the input text changes.
+
+        Parameters:
+            target (str, optional): The text the user has to type. Defaults to an empty string.
+        """
+        self.target = target
+        self.typed_chars = 0
+        self.correct_chars = 0
+
+    @property
+    def incorrect_chars(self):
+        """
+        The number of typed characters that do not match the target text.
+        """
+        return self.typed_chars - self.correct_chars
+
+    def reset(self, target):
+        """
+        Start tracking a new typing test.
+
+        Args:
+            target (str): The text the user has to type.
+
+        Returns:
+            None
+        """
+        self.target = target
+        self.typed_chars = 0
+        self.correct_chars = 0
+
+    def is_correct(self, position, char):
+        """
+        Return True if the character matches the target text at the given position.
+        """
+        return position < len(self.target) and self.target[position] == char
+
+    def add_character(self, position, char, input_text):
+        """
+        Account for a character inserted into the input text.
+
+        Appending at the end is O(1). Inserting anywhere else shifts the following characters, so the tracker
+        falls back to a full recount.
+
+        Args:
+            position (int): The position the character was inserted at.
+            char (str): The inserted character.
+            input_text (str): The input text after the insertion.
+
+        Returns:
+            None
+        """
+        if position != len(input_text) - 1:
+            self.recount(input_text)
+            return
+        self.typed_chars += 1
+        if self.is_correct(position, char):
+            self.correct_chars += 1
+
+    def remove_character(self, position, char, input_text):
+        """
+        Account for a character removed from the input text.
+
+        Removing the last character is O(1). Removing anywhere else shifts the following characters, so the
+        tracker falls back to a full recount.
+
+        Args:
+            position (int): The position the character was removed from.
+            char (str): The removed character.
+            input_text (str): The input text after the removal.
+
+        Returns:
+            None
+        """
+        if position != len(input_text):
+            self.recount(input_text)
+            return
+        self.typed_chars -= 1
+        if self.is_correct(position, char):
+            self.correct_chars -= 1
+
+    def count_correct(self, input_text):
+        """
+        Count the correct characters of the input text from scratch.
+        """
+        return sum(1 for char_input, char_word in zip(input_text, self.target) if char_input == char_word)
+
+    def recount(self, input_text):
+        """
+        Recalculate the counters from scratch.
+
+        Args:
+            input_text (str): The current input text.
+
+        Returns:
+            None
+        """
+        self.typed_chars = len(input_text)
+        self.correct_chars = self.count_correct(input_text)
+
+    def verify(self, input_text):
+        """
+        Compare the counters with a full recount, used as a debug consistency check.
+
+        Args:
+            input_text (str): The current input text.
+
+        Returns:
+            bool: True if the counters are consistent with the input text.
+        """
+        return self.typed_chars == len(input_text) and self.correct_chars == self.count_correct(input_text)
+
+    def accuracy(self):
+        """
+        Return the percentage of the target text that was typed correctly.
+        """
+        return (self.correct_chars / len(self.target)) * 100 if self.target else 0
+
+    def raw_wpm(self, elapsed_time):
+        """
+        Return the words per minute counting every typed character, a word being five characters.
+
+        Args:
+            elapsed_time (float): The elapsed time in seconds.
+
+        Returns:
+            float: The raw WPM.
+        """
+        return (self.typed_chars / 5) / (elapsed_time / 60) if elapsed_time > 0 else 0
+
+    def net_wpm(self, elapsed_time):
+        """
+        Return the raw WPM reduced by the uncorrected errors per minute, never less than zero.
+
+        Args:
+            elapsed_time (float): The elapsed time in seconds.
+
+        Returns:
+            float: The net WPM.
+        """
+        if elapsed_time <= 0:
+            return 0
+        return max(0, self.raw_wpm(elapsed_time) - self.incorrect_chars / (elapsed_time / 60))
@@ -0,0 +1,284 @@
+import datetime
+import json
+import os
+import threading
+import time
+
+
+class StatisticsWriter:
+    def __init__(self, db, db_worker, spool_path, batch_size=20, flush_interval=5.0, on_flushed=None,
+                 max_attempts=5):
+        """
+        Initialize the write-behind queue for game results.
+
+        Results are collected in memory and written in one transaction once batch_size results are waiting or
+        the oldest one waited flush_interval seconds. If the database is unreachable the results are appended to
+        a local spool file, which is replayed with the next successful write, also after a restart.
+
+        A write first moves the spool file aside and only deletes that copy, so results spooled while it runs
+        are never lost. When a batch fails although the database is reachable, its results are written one by
+        one and a result that fails max_attempts times, e.g. of a deleted user, is moved to a quarantine file
+        next to the spool instead of blocking every later write.
+
+        Parameters:
+            db (Database): The database the results are written to.
+            db_worker (DBWorker): The worker the writes run on.
+            spool_path (str): The path of the append-only spool file, one JSON result per line.
+            batch_size (int, optional): The number of waiting results that triggers a write. Defaults to 20.
+            flush_interval (float, optional): The maximum number of seconds a result waits, also the delay
+                between attempts to replay the spool. Defaults to 5.0.
+            on_flushed (callable, optional): Called on the game thread after results were written.
+                Defaults to None.
+            max_attempts (int, optional): The number of failed writes of a single result before it is
+                quarantined. Defaults to 5.
+        """
+        self.db = db
+        self.db_worker = db_worker
+        self.spool_path = spool_path
+        self.sending_path = spool_path + ".sending"
+        root, extension = os.path.splitext(spool_path)
+        self.quarantine_path = root + ".quarantine" + extension
+        self.max_attempts = max_attempts
+        self.spool_lock = threading.Lock()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flushed = on_flushed
+        self.pending = []
+        self.oldest_pending_at = 0
+        self.retry_at = 0
+        self.future = None
+        self.in_flight = []
+        self.user_ids = {}
+
+    def add(self, username, game_id, wpm, accuracy, play_time, user_id=None):
+        """
+        Queue the result of a finished game. This only appends to a list, the write happens in the background.
+
+        Args:
+            username (str): The name of the user, used to look up the user ID if it is not given.
+            game_id (int): The ID of the game.
+            wpm (float): Words per minute typed by the user.
+            accuracy (float): The accuracy of the user's typing.
+            play_time (float): The duration of the game played in seconds.
+            user_id (int, optional): The ID of the user. Defaults to None.
+
+        Returns:
+            None
+        """
+        if not self.pending:
+            self.oldest_pending_at = time.monotonic()
+        self.pending.append({
+            "user_id": user_id,
+            "username": username,
+            "game_id": game_id,
+            "wpm": wpm,
+            "accuracy": accuracy,
+            "play_time": play_time,
+            "date_played": datetime.datetime.now().isoformat(),
+        })
+
+    def has_spool(self):
+        """
+        Return True if results are waiting in the spool file or in the copy of an unfinished write.
+        """
+        return any(os.path.exists(path) and os.path.getsize(path) > 0
+                   for path in (self.spool_path, self.sending_path))
+
+    def poll(self):
+        """
+        Handle a finished write and start the next one when it is due. Called once per frame.
+        """
+        if self.future is not None:
+            if not self.future.done():
+                return
+            future, self.future = self.future, None
+            if future.cancelled() or future.exception() is not None:
+                if future.cancelled():
+                    self.spool(self.in_flight)
+                else:
+                    # The write spooled the results it could not save itself
+                    print("Saving statistics failed, spooling them: {}".format(future.exception()))
+                self.retry_at = time.monotonic() + self.flush_interval
+            elif self.on_flushed:
+                self.on_flushed()
+            self.in_flight = []
+
+        now = time.monotonic()
+        due = len(self.pending) >= self.batch_size or (
+            self.pending and now - self.oldest_pending_at >= self.flush_interval)
+        replay = now >= self.retry_at and self.has_spool()
+        if (due or replay) and now >= self.retry_at:
+            self.start_flush()
+
+    def start_flush(self):
+        """
+        Write the pending results and the spooled ones on the database worker.
+        """
+        self.in_flight, self.pending = self.pending, []
+        self.future = self.db_worker.submit(self.write, list(self.in_flight))
+
+    def write(self, rows):
+        """
+        Write the spooled results and the given ones in a single transaction. Runs on the database worker.
+
+        The spool file is moved aside before it is read and only that copy is deleted, so results spooled
+        meanwhile stay for the next write. The results that cannot be saved are spooled again before the error
+        is raised.
+
+        Args:
+            rows (list): The results queued with add.
+
+        Returns:
+            None
+        """
+        with self.spool_lock:
+            # A copy left by a crashed write is sent first, the spool follows with the next write
+            if not os.path.exists(self.sending_path) and os.path.exists(self.spool_path):
+                os.replace(self.spool_path, self.sending_path)
+        spooled = self.read_spool(self.sending_path)
+        failed = []
+        error = None
+        try:
+            self.insert(spooled + rows)
+        except Exception as batch_error:
+            error = batch_error
+            failed = self.insert_one_by_one(spooled + rows)
+            if failed:
+                self.spool_failed(failed)
+        if spooled:
+            os.remove(self.sending_path)
+        if failed:
+            raise error
+
+    def insert(self, rows):
+        """
+        Insert results in a single transaction.
+        """
+        batch = []
+        for row in rows:
+            user_id = row["user_id"]
+            if user_id is None:
+                user_id = self.get_user_id(row["username"])
+            batch.append((user_id, row["game_id"], row["wpm"], row["accuracy"], row["play_time"],
+                          datetime.datetime.fromisoformat(row["date_played"])))
+        self.db.insert_user_statistics_batch(batch)
+
+    def insert_one_by_one(self, rows):
+        """
+        Insert the results of a failed batch one at a time, so the results that cannot be saved are told apart
+        from the others. Nothing is tried while the database is unreachable.
+
+        Args:
+            rows (list): The results of the failed batch.
+
+        Returns:
+            list: The results that were not saved, with the attempts of the ones that failed on their own
+            counted.
+        """
+        try:
+            self.db.ensure_connection()
+        except Exception:
+            return rows
+        failed = []
+        for row in rows:
+            try:
+                self.insert([row])
+            except Exception:
+                failed.append(dict(row, attempts=row.get("attempts", 0) + 1))
+        return failed
+
+    def spool_failed(self, rows):
+        """
+        Spool the results of a failed write, moving the ones that failed max_attempts times to the quarantine
+        file.
+        """
+        quarantined = [row for row in rows if row.get("attempts", 0) >= self.max_attempts]
+        if quarantined:
+            print("Moving {} result(s) that cannot be saved to {}".format(len(quarantined), self.quarantine_path))
+            self.append_rows(self.quarantine_path, quarantined)
+        self.spool([row for row in rows if row.get("attempts", 0) < self.max_attempts])
+
+    def get_user_id(self, username):
+        """
+        Look up the ID of a user, remembering it for later writes.
+        """
+        if username not in self.user_ids:
+            self.user_ids[username] = self.db.get_user_id_by_username(username)
+        return self.user_ids[username]
+
+    @staticmethod
+    def read_spool(path):
+        """
+        Read the results waiting in a spool file, skipping a line cut short by a crash.
+        """
+        if not os.path.exists(path):
+            return []
+        rows = []
+        with open(path, "r", encoding="utf-8") as spool_file:
+            for line in spool_file:
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return rows
+
+    def spool(self, rows):
+        """
+        Append results to the spool file. Safe to call while a write runs on the database worker.
+        """
+        self.append_rows(self.spool_path, rows)
+
+    def append_rows(self, path, rows):
+        """
+        Append results to a spool or quarantine file, one JSON result per line.
+        """
+        if not rows:
+            return
+        spool_dir = os.path.dirname(path)
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+        with self.spool_lock:
+            with open(path, "a", encoding="utf-8") as spool_file:
+                for row in rows:
+                    spool_file.write(json.dumps(row) + "\n")
+                spool_file.flush()
+                os.fsync(spool_file.fileno())
+
+    def close(self, timeout=5.0):
+        """
+        Write every waiting result before shutting down. Results that cannot be written within the timeout
+        are left in the spool file and replayed on the next start.
+
+        A write still running after the timeout keeps its results: it either saves them or spools them itself,
+        so only the results it has not taken are spooled here.
+
+        Args:
+            timeout (float, optional): The number of seconds to wait for the database. Defaults to 5.0.
+
+        Returns:
+            None
+        """
+        if self.future is not None:
+            try:
+                self.future.result(timeout=timeout)
+            except Exception:
+                # The write failed or did not finish in time, keep the waiting results for the next start. The
+                # results of the write are only spooled here if it never started.
+                self.spool((self.in_flight if self.future.cancel() else []) + self.pending)
+                self.pending = []
+                return
+            finally:
+                self.future = None
+                self.in_flight = []
+
+        if not self.pending and not self.has_spool():
+            return
+        self.start_flush()
+        try:
+            self.future.result(timeout=timeout)
+        except Exception as error:
+            print("Saving statistics failed, spooling them: {}".format(error))
+            if self.future.cancel():
+                self.spool(self.in_flight)
+        self.future = None
+        self.in_flight = []
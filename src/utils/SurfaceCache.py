@@ -0,0 +1,50 @@
+from src.utils.LRUCache import LRUCache
+
+
+class SurfaceCache:
+    def __init__(self, max_surfaces=256):
+        """
+        Initialize a cache of rendered text surfaces.
+
+        Parameters:
+            max_surfaces (int, optional): The size of the LRUCache of surfaces. Defaults to 256.
+        """
+        self.surfaces = LRUCache(max_surfaces)
+
+    @property
+    def hits(self):
+        return self.surfaces.hits
+
+    @property
+    def misses(self):
+        return self.surfaces.misses
+
+    def render(self, font, text, antialias, color):
+        """
+        Return the rendered surface for the text, rasterizing it only if it is not cached yet.
+
+        The returned surface is shared, callers must blit it and never draw onto it.
+
+        Args:
+            font (pygame.font.Font): The font used for rendering.
+            text (str): The text to render.
+            antialias (bool): Whether the text is antialiased.
+            color (tuple): The color of the text.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (text, font, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces.put(key, font.render(text, antialias, color))
+        return surface
+
+    def clear(self):
+        """
+        Drop every cached surface and reset the hit and miss counters.
+        """
+        self.surfaces.clear()
+
+
+surface_cache = SurfaceCache()
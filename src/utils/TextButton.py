@@ -1,5 +1,8 @@
 import pygame
 
+from src.utils.FontRegistry import get_font
+from src.utils.SurfaceCache import surface_cache
+
 
 class TextButton:
     def __init__(self, position, width, height, text, font_path, font_size, text_color, background_color,
@@ -25,7 +28,7 @@ class TextButton:
         self.width = width
         self.height = height
         self.text = text
-        self.font = pygame.font.Font(font_path, font_size)
+        self.font = get_font(font_path, font_size)
         self.text_color = text_color
         self.background_color = background_color
         self.hover_background_color = hover_background_color
@@ -41,7 +44,7 @@ class TextButton:
         pygame.draw.rect(screen, current_color, self.rect)
 
         # Render the text
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = surface_cache.render(self.font, self.text, True, self.text_color)
         # Center the text inside the button
         text_rect = text_surface.get_rect(center=self.rect.center)
 
@@ -0,0 +1,80 @@
+from src.utils.FontRegistry import get_font
+from src.utils.LRUCache import LRUCache
+
+
+class TextLayout:
+    def __init__(self, max_layouts=128):
+        """
+        Initialize the layout engine that wraps text into lines and remembers the resulting line breaks.
+
+        Parameters:
+            max_layouts (int, optional): The size of the LRUCache of layouts. Defaults to 128.
+        """
+        self.layouts = LRUCache(max_layouts)
+
+    def wrap(self, text, font_path, font_size, max_width):
+        """
+        Split the text into lines that fit into the given width.
+
+        Every word is measured once and the lines are built in a single pass, so the cost is linear in the
+        length of the text. The result is cached by (text, font, font size, max width), which means a static
+        text such as the target sentence is only laid out again after a restart or a resize.
+
+        Args:
+            text (str): The text to wrap.
+            font_path (str or None): The path to the font used for measuring.
+            font_size (int): The size of the font used for measuring.
+            max_width (int): The maximum width of a line in pixels.
+
+        Returns:
+            tuple: The wrapped lines. An empty text produces a single empty line.
+        """
+        key = (text, font_path, font_size, max_width)
+        lines = self.layouts.get(key)
+        if lines is None:
+            lines = self.layouts.put(key, self.break_lines(text, get_font(font_path, font_size), max_width))
+        return lines
+
+    @staticmethod
+    def break_lines(text, font, max_width):
+        """
+        Wrap the text with the given font without consulting the cache.
+
+        Args:
+            text (str): The text to wrap.
+            font (pygame.font.Font): The font used for measuring.
+            max_width (int): The maximum width of a line in pixels.
+
+        Returns:
+            tuple: The wrapped lines.
+        """
+        space_width = font.size(' ')[0]
+        lines = []
+        current_line = []
+        current_width = 0
+
+        for word in text.split():
+            word_width = font.size(word)[0]
+            if not current_line:
+                current_line.append(word)
+                current_width = word_width
+            elif current_width + space_width + word_width < max_width:
+                current_line.append(word)
+                current_width += space_width + word_width
+            else:
+                # The line is full, start a new one with the current word
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                current_width = word_width
+
+        lines.append(' '.join(current_line))
+        return tuple(lines)
+
+    def clear(self):
+        """
+        Forget every cached layout.
+        """
+        self.layouts.clear()
+
+
+text_layout = TextLayout()
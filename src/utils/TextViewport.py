@@ -0,0 +1,78 @@
+import re
+from bisect import bisect_right
+
+from src.utils.FontRegistry import get_font
+from src.utils.TextLayout import TextLayout
+
+
+class TextViewport:
+    def __init__(self, visible_lines=3):
+        """
+        Initialize a viewport that shows a few lines of a long text around the typing position.
+
+        The text is wrapped once, when it or the font changes, and the position where every line starts in the
+        text is stored. Finding the line of a position is a binary search over those starts, and only the
+        visible lines are handed out for rendering, so the cost of a frame does not depend on the length of the
+        text. The viewport scrolls a line at a time: the line being typed is always the first visible line.
+
+        Parameters:
+            visible_lines (int, optional): The number of lines shown. Defaults to 3.
+        """
+        self.visible_lines = visible_lines
+        self.key = None
+        self.lines = ()
+        self.starts = [0]
+
+    def layout(self, text, font_path, font_size, max_width):
+        """
+        Wrap the text into lines unless it is already laid out with the same font and width.
+
+        The layout is kept here instead of the shared text layout cache, whose entries are replaced by the
+        input text while typing. The wrapped lines separate their words with single spaces, so the starts are
+        taken from the words of the original text and stay right for text with runs of whitespace.
+
+        Args:
+            text (str): The text to wrap.
+            font_path (str or None): The path to the font used for measuring.
+            font_size (int): The size of the font used for measuring.
+            max_width (int): The maximum width of a line in pixels.
+
+        Returns:
+            None
+        """
+        key = (text, font_path, font_size, max_width)
+        if key == self.key:
+            return
+        self.key = key
+        self.lines = TextLayout.break_lines(text, get_font(font_path, font_size), max_width)
+        word_starts = [match.start() for match in re.finditer(r"\S+", text)]
+        self.starts = [0]
+        word_index = 0
+        for line in self.lines[:-1]:
+            word_index += len(line.split())
+            self.starts.append(word_starts[word_index])
+
+    def line_at(self, position):
+        """
+        Return the index of the line the given position of the text falls on.
+        """
+        return max(bisect_right(self.starts, position) - 1, 0)
+
+    def line_start(self, index):
+        """
+        Return the position in the text where a line starts.
+        """
+        return self.starts[index]
+
+    def get_visible_lines(self, position):
+        """
+        Return the lines shown while the given position is typed: its line and the lines after it.
+
+        Args:
+            position (int): The typing position in the text.
+
+        Returns:
+            tuple: The visible lines.
+        """
+        first = self.line_at(position)
+        return self.lines[first:first + self.visible_lines]
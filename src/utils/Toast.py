@@ -0,0 +1,134 @@
+import pygame
+
+from src.utils.FontRegistry import get_font
+from src.utils.SurfaceCache import surface_cache
+
+
+class Toast:
+    def __init__(self, message, color, expires_at):
+        """
+        Initialize a notification shown until expires_at, or until it is dismissed if expires_at is None.
+        """
+        self.message = message
+        self.color = color
+        self.expires_at = expires_at
+
+
+class ToastManager:
+    def __init__(self, duration_ms=2000, max_toasts=3, font_path=None, font_size=30,
+                 background_color=(40, 50, 52), padding=10):
+        """
+        Initialize the notifications shown on top of every screen.
+
+        Toasts expire on their own as the main loop keeps running, so showing a message never blocks the
+        event loop the way pygame.time.delay does.
+
+        Parameters:
+            duration_ms (int, optional): How long a toast is shown. Defaults to 2000.
+            max_toasts (int, optional): The number of toasts shown at once, the oldest one is dropped when a new
+                one would exceed it. Defaults to 3.
+            font_path (str, optional): The font of the messages. Defaults to None (pygame's default font).
+            font_size (int, optional): The font size of the messages. Defaults to 30.
+            background_color (tuple, optional): The color of the box behind the messages.
+            padding (int, optional): The space around a message in pixels. Defaults to 10.
+        """
+        self.duration_ms = duration_ms
+        self.max_toasts = max_toasts
+        self.font_path = font_path
+        self.font_size = font_size
+        self.background_color = background_color
+        self.padding = padding
+        self.toasts = []
+
+    def show(self, message, color=(255, 255, 255), duration_ms=None, sticky=False):
+        """
+        Show a message.
+
+        Args:
+            message (str): The message.
+            color (tuple, optional): The color of the message. Defaults to white.
+            duration_ms (int, optional): How long the message is shown. Defaults to the manager's duration.
+            sticky (bool, optional): Keep the message until it is dismissed. Defaults to False.
+
+        Returns:
+            Toast: The shown toast, which can be passed to dismiss.
+        """
+        expires_at = None
+        if not sticky:
+            expires_at = pygame.time.get_ticks() + (duration_ms or self.duration_ms)
+        toast = Toast(message, color, expires_at)
+        self.toasts.append(toast)
+        del self.toasts[:-self.max_toasts]
+        return toast
+
+    def dismiss(self, toast):
+        """
+        Remove a toast before it expires, e.g. a sticky progress message once the work is done.
+        """
+        if toast in self.toasts:
+            self.toasts.remove(toast)
+
+    def update(self):
+        """
+        Drop the expired toasts. Called once per frame.
+        """
+        now = pygame.time.get_ticks()
+        self.toasts = [toast for toast in self.toasts if toast.expires_at is None or toast.expires_at > now]
+
+    def ms_until_change(self):
+        """
+        Return the time until the next toast expires, or None if no toast expires on its own.
+        """
+        expiries = [toast.expires_at for toast in self.toasts if toast.expires_at is not None]
+        if not expiries:
+            return None
+        return max(0, min(expiries) - pygame.time.get_ticks())
+
+    def get_state(self):
+        """
+        Return a comparable value describing the shown toasts, for the dirty rectangle renderer.
+        """
+        return tuple((toast.message, toast.color) for toast in self.toasts)
+
+    def get_line_height(self):
+        """
+        Return the height of one toast including its padding.
+        """
+        return get_font(self.font_path, self.font_size).get_linesize() + 2 * self.padding
+
+    def get_rect(self, center):
+        """
+        Return the area covered by the toasts, stacked downwards from the given center.
+
+        Args:
+            center (tuple): The center of the first toast.
+
+        Returns:
+            pygame.Rect: The covered area, empty if no toast is shown.
+        """
+        font = get_font(self.font_path, self.font_size)
+        width = max((font.size(toast.message)[0] for toast in self.toasts), default=0) + 2 * self.padding
+        rect = pygame.Rect(0, 0, width, self.get_line_height() * len(self.toasts))
+        rect.midtop = (center[0], center[1] - self.get_line_height() // 2)
+        return rect
+
+    def draw(self, screen, center):
+        """
+        Draw the toasts, newest last.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            center (tuple): The center of the first toast.
+
+        Returns:
+            None
+        """
+        font = get_font(self.font_path, self.font_size)
+        line_height = self.get_line_height()
+        x, y = center
+        for toast in self.toasts:
+            text_surface = surface_cache.render(font, toast.message, True, toast.color)
+            box = text_surface.get_rect(center=(x, y)).inflate(2 * self.padding, 2 * self.padding)
+            pygame.draw.rect(screen, self.background_color, box, border_radius=6)
+            screen.blit(text_surface, text_surface.get_rect(center=(x, y)))
+            y += line_height